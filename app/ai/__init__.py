@@ -1,3 +1,5 @@
-from app.ai.batch_processor import start_batch_processor
+from app.ai.batch_processor import MicroBatcher
+from app.ai.person_detection_service import PersonDetectionService
+from app.ai.recognition_broker import RecognitionBroker
 from app.ai.types import Detection
-__all__ = ["start_batch_processor", "Detection"]
\ No newline at end of file
+__all__ = ["MicroBatcher", "PersonDetectionService", "RecognitionBroker", "Detection"]
@@ -1,120 +1,107 @@
+import os
 import time
-from app.ai.align_faces import align_faces
-from app.ai.debug_face_saver import save_faces
-from app.ai.debug_tracking import debug_tracking
-from app.ai.face_filter import filter_and_crop
-from app.ai.remove_duplicate_detections import remove_duplicate_detections
-from app.ai.tracker_service import ByteTrackerService
-from app.camera.frame_queue import frame_queue
-from typing import List
-from app.camera import FrameMessage
-from app.ai.insight_detector import InsightFaceEngine
-from app.camera.types import Detection
-
-BATCH_SIZE = 8
-BATCH_TIMEOUT = 0.02  # 20ms
-
-face_detector = InsightFaceEngine()
-tracker_service = ByteTrackerService()
-
-def start_batch_processor() -> None:
-    """
-    Continuously collects frames and processes batches.
-    Simulates GPU inference pipeline.
-    """
+import threading
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Any, Callable, List, Optional
 
-    print("[AI] Batch processor started")
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "8"))
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", "0.02"))  # 20ms
+# longest a caller waits for its result before giving up (dead dispatcher, hung model)
+BATCH_RESULT_TIMEOUT = float(os.getenv("BATCH_RESULT_TIMEOUT", "10.0"))
 
-    while True:
-        batch: List[FrameMessage] = []
 
-        start_time = time.time()
-
-        # Collect frames for up to 20ms OR until we have 8 frames — whichever comes first.
-        while len(batch) < BATCH_SIZE:
-            remaining = BATCH_TIMEOUT - (time.time() - start_time)
+class MicroBatcher:
+    """
+    Collects requests from many threads and runs them as one batch.
+
+    - submit(item) returns a Future; infer(item) blocks on it for at most
+      BATCH_RESULT_TIMEOUT (concurrent.futures.TimeoutError after that).
+    - The dispatcher thread waits for the first item, then keeps collecting
+      until `max_batch` items or `max_wait` seconds — whichever comes first.
+    - run_batch(items) must return one result per item, in order.
+      If it raises or returns the wrong number of results, every Future in
+      that batch gets an exception; nothing is silently dropped.
+
+    Set max_batch to the number of producers (e.g. cameras) so a full round
+    dispatches immediately instead of waiting out the window.
+    """
 
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch: int = BATCH_SIZE,
+        max_wait: float = BATCH_TIMEOUT,
+    ):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+
+        self._queue = Queue()
+
+        self.batches = 0
+        self.items = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"batch-{name}", daemon=True)
+        self._thread.start()
+
+        print(f"[AI] Batcher started → {name} (max_batch={self.max_batch}, max_wait={self.max_wait * 1000:.0f}ms)")
+
+    # -----------------------------
+    # CLIENT SIDE
+    # -----------------------------
+    def submit(self, item: Any) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def infer(self, item: Any, timeout: Optional[float] = BATCH_RESULT_TIMEOUT) -> Any:
+        return self.submit(item).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "avg_batch": self.items / self.batches if self.batches else 0.0,
+        }
+
+    # -----------------------------
+    # DISPATCHER
+    # -----------------------------
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
             if remaining <= 0:
                 break
 
-            msg = frame_queue.pop(timeout=remaining)
-
-            if msg is not None:
-                batch.append(msg)
-
-        # If no frames → continue loop
-        if not batch:
-            continue
-
-        _process_batch(batch)
-
-def _process_batch(batch: List[FrameMessage]) -> None:
-    """
-    Real pipeline stages: 
-    Extract frames
-    """ 
-
-    frames = []
-    camera_codes = []
-    timestamps = []
-
-    for msg in batch:
-        frames.append(msg.frame)
-        camera_codes.append(msg.camera_code)
-        timestamps.append(msg.timestamp)
-
-    # Face Detection
-    detections = _run_detection(frames, camera_codes, timestamps)
-
-    print(f"[AI] detections={len(detections)}")
-
-    # Remove duplicates detections
-    detections = remove_duplicate_detections(detections)
-
-    # print("[AI] detections", len(detections))
-
-    # Tracking
-    # 🔥 2️⃣ Correct tracking (sequential)
-    tracked_detections = tracker_service.update_sequential(detections)
-
-    debug_tracking(tracked_detections)
-    # Debug
-    # print("[AI] track_ids", [d.track_id for d in tracked_detections])
-
-   
-    # face_crops = filter_and_crop(tracked_detections)
-
-    # aligned_faces = align_faces(tracked_detections) 
-
-
-    # save_faces(tracked_detections)
-    # print("[AI] aligned_faces", tracked_detections)
-
-    # print(f"[AI] usable faces={len(aligned_faces)}")
-
-
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
 
-def _run_detection(frames, camera_codes, timestamps):
-    # detections = []
+        return batch
 
-    # for frame, cam_code, ts in zip(frames, camera_codes, timestamps):
-    #     faces = face_detector.detect(frame) or []
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
 
-    #     # print(f"[AI] Detected {cam_code} {len(faces)} faces")
-    #     for face in faces:
-    #         detections.append(
-    #             Detection(
-    #                 camera_code=cam_code,
-    #                 timestamp=ts,
-    #                 frame=frame,
-    #                 bbox=face["bbox"],
-    #                 landmarks=face["landmarks"],
-    #                 score=face["score"],
-    #                 pose=face["pose"],
-    #                 age=face["age"],
-    #                 gender=face["gender"]
-    #             )
-    #         )
-    return detections
+            try:
+                results = self.run_batch(items)
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{len(results)} results for {len(batch)} items")
+            except Exception as e:
+                print(f"[AI] ❌ Batch failed → {self.name}: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
 
+            self.batches += 1
+            self.items += len(batch)
 
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,41 @@
+import lap
+import numpy as np
+
+
+def iou_matrix(boxes_a, boxes_b) -> np.ndarray:
+    """
+    Pairwise IoU of xyxy boxes: (N,4) x (M,4) → (N,M).
+    """
+    a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0).astype(np.float32)
+
+
+def linear_assignment(cost: np.ndarray, max_cost: float):
+    """
+    Optimal one-to-one assignment (lap.lapjv) ignoring pairs costlier than max_cost.
+    Returns (matches (K,2) [row, col], unmatched_rows, unmatched_cols).
+    """
+    rows, cols = cost.shape
+    if rows == 0 or cols == 0:
+        return np.empty((0, 2), dtype=np.int64), np.arange(rows), np.arange(cols)
+
+    _, x, y = lap.lapjv(cost, extend_cost=True, cost_limit=max_cost)
+
+    matches = np.array([[i, j] for i, j in enumerate(x) if j >= 0], dtype=np.int64).reshape(-1, 2)
+    return matches, np.where(x < 0)[0], np.where(y < 0)[0]
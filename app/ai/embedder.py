@@ -0,0 +1,143 @@
+import os
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from app.ai.face_aligner import align_face
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ADAFACE_MODEL = os.getenv(
+    "ADAFACE_MODEL",
+    os.path.abspath(os.path.join(BASE_DIR, "../../models/adaface/adaface_ir101.onnx"))
+)
+# buffalo_l's recognition model, used when the engine does not hand its own over
+ARCFACE_MODEL = os.getenv(
+    "ARCFACE_MODEL",
+    os.path.expanduser("~/.insightface/models/buffalo_l/w600k_r50.onnx")
+)
+
+
+def l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+class FaceEmbedder:
+    """
+    Aligned 112x112 BGR face crops → L2-normalized float32 embeddings (N, dim).
+
+    `name` is stored next to every vector (EmbeddingStore / UnknownEmbeddingStore)
+    so galleries built by different models are never compared.
+    """
+
+    name = None
+    dim = 512
+    input_size = 112
+
+    def embed(self, crops: List[np.ndarray]) -> np.ndarray:
+        raise NotImplementedError
+
+    def align(self, image: np.ndarray, landmarks: np.ndarray) -> Optional[np.ndarray]:
+        return align_face(image, np.asarray(landmarks, dtype=np.float32), self.input_size)
+
+    def embed_faces(self, images: List[np.ndarray], landmarks: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """
+        One batch for many faces (each from its own image); None where alignment failed.
+        """
+        crops = [self.align(image, kps) for image, kps in zip(images, landmarks)]
+        valid = [i for i, crop in enumerate(crops) if crop is not None]
+
+        result = [None] * len(crops)
+        if not valid:
+            return result
+
+        embeddings = self.embed([crops[i] for i in valid])
+        for i, embedding in zip(valid, embeddings):
+            result[i] = embedding
+
+        return result
+
+
+class ArcFaceEmbedder(FaceEmbedder):
+    """
+    buffalo_l ArcFace (w600k_r50) through insightface's ArcFaceONNX.get_feat.
+    Pass the engine's buffalo_l recognition model to share its session.
+    """
+
+    name = "arcface"
+
+    def __init__(self, model=None, model_path: str = ARCFACE_MODEL):
+        if model is None:
+            from insightface.model_zoo import get_model
+
+            model = get_model(model_path, providers=["CUDAExecutionProvider", "CPUExecutionProvider"])
+            model.prepare(ctx_id=0)
+
+        self.model = model
+        self.input_size = model.input_size[0]
+
+    def embed(self, crops: List[np.ndarray]) -> np.ndarray:
+        if not crops:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return l2_normalize(self.model.get_feat(crops))
+
+
+class AdaFaceEmbedder(FaceEmbedder):
+    """
+    AdaFace IR101 on onnxruntime (models/adaface/adaface_ir101.onnx).
+    Input is BGR, (x / 255 - 0.5) / 0.5, NCHW; the first output is the feature
+    (the second, when exported, is its norm and is ignored).
+    """
+
+    name = "adaface"
+
+    def __init__(self, model_path: str = ADAFACE_MODEL):
+        import onnxruntime as ort
+
+        available = ort.get_available_providers()
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+
+        self.session = ort.InferenceSession(model_path, providers=providers)
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.batch_dynamic = not isinstance(model_input.shape[0], int)
+        self.input_size = int(model_input.shape[2]) if isinstance(model_input.shape[2], int) else 112
+
+        print(f"[AI] AdaFace embedder ready → {model_path} ({self.session.get_providers()[0]})")
+
+    def embed(self, crops: List[np.ndarray]) -> np.ndarray:
+        if not crops:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        if not self.batch_dynamic and len(crops) > 1:
+            return np.concatenate([self.embed([crop]) for crop in crops])
+
+        size = (self.input_size, self.input_size)
+        blob = np.stack([
+            crop if crop.shape[:2] == size else cv2.resize(crop, size)
+            for crop in crops
+        ]).transpose(0, 3, 1, 2).astype(np.float32)
+        blob /= 127.5
+        blob -= 1.0
+
+        features = self.session.run(None, {self.input_name: blob})[0]
+        return l2_normalize(features)
+
+
+def create_face_embedder(backend: str = None, recognition_model=None) -> FaceEmbedder:
+    """
+    Embedder for the configured backend (FACE_EMBEDDER: "arcface" or "adaface").
+    """
+    # imported here so app.ai (RecognitionBroker, MicroBatcher) loads without the app config
+    from app.config.config import envConfig
+
+    backend = (backend or envConfig.FACE_EMBEDDER).lower()
+
+    if backend == "adaface":
+        return AdaFaceEmbedder()
+
+    return ArcFaceEmbedder(recognition_model)
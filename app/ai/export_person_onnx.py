@@ -0,0 +1,29 @@
+"""
+Offline export of the YOLO person detector to ONNX (the only place ultralytics is needed).
+
+    python -m app.ai.export_person_onnx [weights.pt] [output.onnx]
+
+The model is exported with dynamic batch/height/width so OnnxPersonDetector can
+batch cameras and use rectangular letterboxing like ultralytics predict().
+"""
+import os
+import shutil
+import sys
+
+from app.ai.onnx_person_detector import PERSON_ONNX_MODEL
+from app.ai.person_detector import PERSON_IMGSZ
+
+
+def export(weights: str = "yolov8n.pt", output: str = PERSON_ONNX_MODEL) -> str:
+    from ultralytics import YOLO
+
+    exported = YOLO(weights).export(format="onnx", imgsz=PERSON_IMGSZ, dynamic=True, simplify=True)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    shutil.move(exported, output)
+    print(f"[AI] Exported {weights} → {output}")
+    return output
+
+
+if __name__ == "__main__":
+    export(*sys.argv[1:3])
@@ -11,6 +11,34 @@ REFERENCE_LANDMARKS = np.array([
 ], dtype=np.float32)
 
 
+def similarity_transform(src: np.ndarray, dst: np.ndarray):
+    """
+    Least-squares similarity (rotation, uniform scale, translation) src → dst as a
+    2x3 matrix (Umeyama), the fit insightface's norm_crop uses. Every landmark
+    counts, unlike estimateAffinePartial2D's default RANSAC; None if degenerate.
+    """
+    src_mean = src.mean(axis=0)
+    dst_mean = dst.mean(axis=0)
+    src_demean = src - src_mean
+    dst_demean = dst - dst_mean
+
+    src_var = (src_demean ** 2).sum() / len(src)
+    if src_var < 1e-12:
+        return None
+
+    cov = dst_demean.T @ src_demean / len(src)
+    d = np.ones(2)
+    if np.linalg.det(cov) < 0:
+        d[1] = -1
+
+    U, S, Vt = np.linalg.svd(cov)
+    rotation = U @ np.diag(d) @ Vt
+    scale = (S * d).sum() / src_var
+    translation = dst_mean - scale * rotation @ src_mean
+
+    return np.hstack([scale * rotation, translation[:, None]])
+
+
 def align_face(image: np.ndarray, landmarks: np.ndarray, output_size: int = 112):
     """
     Align face using 5 landmarks.
@@ -28,8 +56,8 @@ def align_face(image: np.ndarray, landmarks: np.ndarray, output_size: int = 112)
         scale = output_size / 112
         dst *= scale
 
-    # Estimate affine transform
-    M, _ = cv2.estimateAffinePartial2D(src, dst)
+    # Estimate similarity transform
+    M = similarity_transform(src.astype(np.float64), dst.astype(np.float64))
 
     if M is None:
         return None
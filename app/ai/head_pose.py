@@ -0,0 +1,60 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Generic face (mm) for the SCRFD keypoint order: left eye, right eye, nose, left mouth, right mouth.
+# Camera axes: x → image right, y → image down, z → away from the camera (nose tip is closest).
+FACE_MODEL_5 = np.array([
+    [-31.5, -36.0,  0.0],
+    [ 31.5, -36.0,  0.0],
+    [  0.0,   0.0, -27.0],
+    [-26.0,  37.0, -2.0],
+    [ 26.0,  37.0, -2.0],
+], dtype=np.float64)
+
+_PNP_FLAG = getattr(cv2, "SOLVEPNP_SQPNP", cv2.SOLVEPNP_EPNP)
+
+
+class HeadPoseEstimator:
+    """
+    (yaw, pitch, roll) in degrees from the 5 detector keypoints via solvePnP
+    against a fixed generic face — replaces buffalo_l's 3d68 landmark model.
+
+    Pinhole camera with focal length = image width, centred principal point,
+    no distortion; camera matrices are cached per image size.
+    Yaw > 0: face turned towards image left. Pitch > 0: face tilted down.
+    Roll > 0: face rotated clockwise in the image.
+    """
+
+    def __init__(self, model_points: np.ndarray = FACE_MODEL_5):
+        self.model_points = np.ascontiguousarray(model_points, dtype=np.float64)
+        self._dist = np.zeros((4, 1), dtype=np.float64)
+        self._cameras = {}
+
+    def _camera(self, h: int, w: int) -> np.ndarray:
+        camera = self._cameras.get((h, w))
+
+        if camera is None:
+            camera = np.array([
+                [w, 0, w / 2],
+                [0, w, h / 2],
+                [0, 0, 1],
+            ], dtype=np.float64)
+            self._cameras[(h, w)] = camera
+
+        return camera
+
+    def estimate(self, kps: np.ndarray, image_shape) -> Optional[Tuple[float, float, float]]:
+        points = np.ascontiguousarray(kps, dtype=np.float64).reshape(5, 2)
+        h, w = image_shape[:2]
+
+        ok, rvec, _ = cv2.solvePnP(self.model_points, points, self._camera(h, w), self._dist, flags=_PNP_FLAG)
+        if not ok:
+            return None
+
+        rotation, _ = cv2.Rodrigues(rvec)
+        # Euler angles (degrees) about x, y, z
+        (pitch, yaw, roll), *_ = cv2.RQDecomp3x3(rotation)
+
+        return float(yaw), float(pitch), float(roll)
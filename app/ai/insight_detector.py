@@ -1,12 +1,55 @@
-from insightface.app import FaceAnalysis
+import os
+
+from insightface.app.common import Face
+from insightface.model_zoo import get_model
+from insightface.utils import ensure_available
 import numpy as np
 import cv2
 from datetime import datetime
 
+from app.ai.embedder import create_face_embedder
+from app.ai.head_pose import HeadPoseEstimator
+from app.ai.roi_packer import RoiPacker
+from app.ai.scrfd_detector import ScrfdDetector
 from app.config.config import envConfig
 
 now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+# Detector input sizes to pick from per call (multiples of 32); the largest is the prepared det_size.
+FACE_DET_SIZES = sorted(int(s) for s in os.getenv("FACE_DET_SIZES", "160,320,640").split(",") if s.strip())
+# smallest detector input may shrink an image's longest side to this fraction; 1.0 never
+# downscales (CCTV faces are already near MIN_RECOGNITION_FACE_WIDTH), < 1.0 trades recall for speed
+FACE_DET_MIN_SCALE = float(os.getenv("FACE_DET_MIN_SCALE", "1.0"))
+# "scrfd" → standalone ScrfdDetector (own session, batched canvases); "insightface" → buffalo_l's det_model
+FACE_DETECTOR = os.getenv("FACE_DETECTOR", "scrfd").lower()
+# genderage is only loaded (and run in embed_faces) when enabled
+FACE_AGE_GENDER = os.getenv("FACE_AGE_GENDER", "false").lower() in ("1", "true", "yes")
+
+# buffalo_l pack file per module; FaceAnalysis would open a session for every model in the
+# pack and requires "detection" even when SCRFD runs standalone
+BUFFALO_L_FILES = {
+    "detection": "det_10g.onnx",
+    "recognition": "w600k_r50.onnx",
+    "genderage": "genderage.onnx",
+}
+
+def load_buffalo_l(modules, det_size, root="~/.insightface"):
+    """
+    Only the requested buffalo_l modules, prepared → {taskname: model}.
+    """
+    pack_dir = ensure_available("models", "buffalo_l", root=root)
+    models = {}
+
+    for module in modules:
+        model = get_model(os.path.join(pack_dir, BUFFALO_L_FILES[module]), providers=["CUDAExecutionProvider"])
+        if module == "detection":
+            model.prepare(ctx_id=0, input_size=det_size) # ctx_id=0 means use first GPU
+        else:
+            model.prepare(ctx_id=0)
+        models[module] = model
+
+    return models
+
 class InsightFaceEngine:
     """
     det_score < 0.4  → very uncertain detection, likely false positive
@@ -18,22 +61,177 @@ class InsightFaceEngine:
     MIN_FACE_SIZE = envConfig.MIN_FACE_SIZE
     MIN_SCORE = 0.60
 
-    def __init__(self, det_size=(640, 640)):
-        self.app = FaceAnalysis(
-            name="buffalo_l",
-            providers=["CUDAExecutionProvider"]
-        )
+    def __init__(self, det_sizes=FACE_DET_SIZES):
+        # buffalo_l without the 2d106/3d68 landmark models: pose comes from the 5 keypoints
+        # (and without its detector when the standalone SCRFD runs)
+        allowed_modules = []
+        if FACE_DETECTOR != "scrfd":
+            allowed_modules.append("detection")
+        if envConfig.FACE_EMBEDDER == "arcface":
+            allowed_modules.append("recognition")
+        if FACE_AGE_GENDER:
+            allowed_modules.append("genderage")
+
+        det_size = (det_sizes[-1], det_sizes[-1])
+        self.models = load_buffalo_l(allowed_modules, det_size)
+
+        if FACE_DETECTOR == "scrfd":
+            self.detector = ScrfdDetector(det_thresh=envConfig.SCRFD_THRESHOLD, input_size=det_size)
+        else:
+            self.detector = self.models["detection"]
+
+        # A detector exported with a fixed input shape only runs at that size.
+        input_shape = self.detector.session.get_inputs()[0].shape
+        self.det_sizes = det_sizes if isinstance(input_shape[2], str) else [det_sizes[-1]]
+
+        self.packer = RoiPacker(canvas_size=det_sizes[-1])
+        self.head_pose = HeadPoseEstimator()
+
+        # embeddings come from the configured backend, batched over all faces of a call
+        self.embedder = create_face_embedder(recognition_model=self.models.get("recognition"))
+
+        print(f"[AI] InsightFace Engine Ready (GPU Enabled), detector={FACE_DETECTOR}, embedder={self.embedder.name}, det sizes={self.det_sizes}, modules={list(self.models)}")
+
+    def _det_size_for(self, img):
+        """
+        Smallest prepared size that keeps at least FACE_DET_MIN_SCALE of the image's
+        (or (h, w) shape's) longest side (largest one otherwise). SCRFD cost grows with input area:
+        a 150x300 head ROI runs at 320 instead of 640, without shrinking its faces.
+        """
+        needed = max(img[:2] if isinstance(img, tuple) else img.shape[:2]) * FACE_DET_MIN_SCALE
+
+        for size in self.det_sizes:
+            if size >= needed:
+                return (size, size)
+
+        return (self.det_sizes[-1], self.det_sizes[-1])
+
+    def detection_cost(self, shapes, packed: bool = False) -> int:
+        """
+        Detector input pixels for ROIs of these (h, w) shapes: the padded square input
+        each ROI (or, packed, each canvas) will actually run at.
+        """
+        if packed and len(shapes) > 1:
+            shapes = [canvas_shape for canvas_shape, _ in self.packer.layout(shapes)]
+
+        return sum(self._det_size_for(tuple(shape))[0] ** 2 for shape in shapes)
+
+    def _get_faces(self, img: np.ndarray, det_size=None):
+        """
+        FaceAnalysis.get() with a per-call detector input size, detection stage only.
+        SCRFD.detect rescales boxes and keypoints back to img coordinates itself.
+        """
+        input_size = (det_size, det_size) if det_size else self._det_size_for(img)
+        bboxes, kpss = self.detector.detect(img, max_num=0, metric="default", input_size=input_size)
+        if bboxes.shape[0] == 0:
+            return []
+
+        faces = [
+            Face(
+                bbox=bboxes[i, 0:4],
+                kps=kpss[i] if kpss is not None else None,
+                det_score=bboxes[i, 4]
+            )
+            for i in range(bboxes.shape[0])
+        ]
+
+        self._detection_stage([img] * len(faces), faces)
+        return faces
+
+    def _detection_stage(self, images, faces):
+        """
+        What the filters need besides the box: (yaw, pitch, roll) from the 5 keypoints.
+        """
+        for img, face in zip(images, faces):
+            if face.kps is not None:
+                face.pose = self.head_pose.estimate(face.kps, img.shape)
+
+    def _feature_stage(self, images, faces):
+        """
+        Age/gender per face, then one embedder batch for every face.
+        """
+        genderage = self.models.get("genderage")
+        if genderage is not None:
+            for img, face in zip(images, faces):
+                genderage.get(img, face)
+
+        embeddings = self.embedder.embed_faces(images, [face.kps for face in faces])
+        for face, embedding in zip(faces, embeddings):
+            face.embedding = embedding
+
+    def detect_faces(self, frame: np.ndarray, offset=(0, 0), camera_code=None, det_size=None):
+        """
+        Detection stage only: result dicts with bbox/score/landmarks/pose and
+        embedding/age/gender = None. Call embed_faces() on the ones worth keeping.
+
+        frame    : ROI or full frame
+        offset   : (x_offset, y_offset) if frame is cropped ROI
+        det_size : square detector input; default picks from FACE_DET_SIZES
+        """
+        faces = self._get_faces(frame, det_size)
+        return self._to_results(faces, frame, offset, camera_code)
+
+    def detect_faces_batch(self, rois, offsets, camera_code=None):
+        """
+        detect_faces for many ROIs at once: the ROIs are tiled onto a few canvases
+        (RoiPacker) and the detector runs once per canvas. Landmarks/pose still run
+        on each face's own ROI. Returns one result list per ROI.
+        """
+        faces_per_roi = [[] for _ in rois]
+        images, faces = [], []
+
+        packed = self.packer.pack(rois)
+        detections = self._detect_canvases([canvas for canvas, _ in packed])
+
+        for (canvas, tiles), (bboxes, kpss) in zip(packed, detections):
+            for i in range(bboxes.shape[0]):
+                tile = self.packer.tile_for(tiles, bboxes[i, 0:4])
+                if tile is None:
+                    continue
+
+                face = Face(
+                    bbox=tile.to_roi(bboxes[i, 0:4]),
+                    kps=tile.to_roi(kpss[i]) if kpss is not None else None,
+                    det_score=bboxes[i, 4]
+                )
+
+                images.append(rois[tile.index])
+                faces.append(face)
+                faces_per_roi[tile.index].append(face)
+
+        self._detection_stage(images, faces)
+
+        return [
+            self._to_results(faces, roi, offset, camera_code)
+            for faces, roi, offset in zip(faces_per_roi, rois, offsets)
+        ]
+
+    def embed_faces(self, results):
+        """
+        Feature stage for detect_faces results (in place, one embedder batch).
+        Returns the results that got an embedding.
+        """
+        pending = [r for r in results if r.get("embedding") is None and "_source" in r]
+
+        if pending:
+            images = [r["_source"][0] for r in pending]
+            faces = [r["_source"][1] for r in pending]
+            self._feature_stage(images, faces)
+
+            for result, face in zip(pending, faces):
+                del result["_source"]
+                result["embedding"] = face.embedding
+                result["age"] = int(face.age) if face.age is not None else None
+                result["gender"] = int(face.gender) if face.gender is not None else None
 
-        self.app.prepare(ctx_id=0, det_size=det_size) # ctx_id=0 means use first GPU 
-        print("[AI] InsightFace Engine Ready (GPU Enabled)")
+        return [r for r in results if r.get("embedding") is not None]
 
-    def detect_and_generate_embedding(self, frame: np.ndarray, offset=(0, 0), camera_code=None):
+    def detect_and_generate_embedding(self, frame: np.ndarray, offset=(0, 0), camera_code=None, det_size=None):
         """
-        frame  : ROI or full frame
-        offset : (x_offset, y_offset) if frame is cropped ROI
+        detect_faces + embed_faces for every face.
         """
 
-        faces = self.app.get(frame)
+        faces = self.detect_faces(frame, offset, camera_code, det_size)
         """
         Resize for Detection 640 * 640
         Detect Face
@@ -42,6 +240,43 @@ class InsightFaceEngine:
         Recognition Resize 112 * 112 * 3. this size arcface expects.
         """
 
+        return self.embed_faces(faces)
+
+    def detect_and_generate_embedding_batch(self, rois, offsets, camera_code=None):
+        """
+        detect_faces_batch + embed_faces, one embedder batch over all ROIs.
+        """
+        results = self.detect_faces_batch(rois, offsets, camera_code)
+        embedded = {id(r) for r in self.embed_faces([r for faces in results for r in faces])}
+
+        return [[r for r in faces if id(r) in embedded] for faces in results]
+
+    def _detect_canvases(self, canvases):
+        """
+        Detector output per canvas. With ScrfdDetector, canvases sharing an input
+        size go through the session as one batch.
+        """
+        sizes = [self._det_size_for(canvas) for canvas in canvases]
+
+        if not hasattr(self.detector, "detect_batch"):
+            return [
+                self.detector.detect(canvas, max_num=0, metric="default", input_size=size)
+                for canvas, size in zip(canvases, sizes)
+            ]
+
+        detections = [None] * len(canvases)
+        for size in set(sizes):
+            indices = [i for i, s in enumerate(sizes) if s == size]
+            for i, result in zip(indices, self.detector.detect_batch([canvases[i] for i in indices], size)):
+                detections[i] = result
+
+        return detections
+
+    def _to_results(self, faces, image, offset=(0, 0), camera_code=None):
+        """
+        insightface Face objects → result dicts in frame coordinates.
+        "_source" keeps (image, face) for embed_faces until it runs.
+        """
         if not faces:
             return []
 
@@ -59,10 +294,6 @@ class InsightFaceEngine:
             width = bbox[2] - bbox[0]
             height = bbox[3] - bbox[1]
 
-            embedding = face.embedding.astype(np.float32)
-            # normalize once
-            embedding /= np.linalg.norm(embedding)
-
             # print(f"[{now}][Detect_Face_Size][Camera {camera_code}] Face size: {width}x{height}, score: {score:.2f}, pose: {face.pose}, gender:{face.gender}")
             # continue 
 
@@ -98,10 +329,11 @@ class InsightFaceEngine:
                 "bbox": global_bbox,
                 "score": score,
                 "landmarks": face.kps.astype(np.int32),
-                "embedding": embedding,   # 512-d vector
+                "embedding": None,   # 512-d vector, L2-normalized (embed_faces)
                 "pose": (yaw, pitch, roll),
-                "age": int(face.age) if hasattr(face, "age") else None,
-                "gender": int(face.gender) if hasattr(face, "gender") else None
+                "age": None,
+                "gender": None,
+                "_source": (image, face)
             })
 
         return results
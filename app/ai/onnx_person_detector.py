@@ -0,0 +1,162 @@
+import os
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PERSON_ONNX_MODEL = os.getenv(
+    "PERSON_ONNX_MODEL",
+    os.path.abspath(os.path.join(BASE_DIR, "../../models/yolov8n.onnx"))
+)
+# same defaults as ultralytics predict()
+PERSON_NMS_IOU = float(os.getenv("PERSON_NMS_IOU", "0.7"))
+PERSON_MAX_DET = int(os.getenv("PERSON_MAX_DET", "300"))
+
+_STRIDE = 32
+_PAD_VALUE = 114
+
+
+def letterbox(frame: np.ndarray, new_shape: Tuple[int, int]):
+    """
+    Resize keeping aspect ratio and pad to new_shape (h, w), centred like ultralytics.
+    Returns (image, ratio, (pad_x, pad_y)).
+    """
+    h, w = frame.shape[:2]
+    r = min(new_shape[0] / h, new_shape[1] / w)
+
+    new_w, new_h = int(round(w * r)), int(round(h * r))
+    pad_x = (new_shape[1] - new_w) / 2
+    pad_y = (new_shape[0] - new_h) / 2
+
+    if (new_w, new_h) != (w, h):
+        frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    image = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(_PAD_VALUE,) * 3)
+
+    return image, r, (left, top)
+
+
+def _input_shape(frames: List[np.ndarray], imgsz: int, dynamic: bool) -> Tuple[int, int]:
+    """
+    Network input (h, w). A dynamic model with same-size frames gets the minimal
+    stride-aligned rectangle (ultralytics' rect inference); otherwise imgsz x imgsz.
+    """
+    shapes = {f.shape[:2] for f in frames}
+    if not dynamic or len(shapes) != 1:
+        return imgsz, imgsz
+
+    h, w = shapes.pop()
+    r = min(imgsz / h, imgsz / w)
+    new_h, new_w = int(round(h * r)), int(round(w * r))
+    return int(np.ceil(new_h / _STRIDE) * _STRIDE), int(np.ceil(new_w / _STRIDE) * _STRIDE)
+
+
+def decode_person_output(pred: np.ndarray, ratio: float, pad, frame_shape, conf: float, iou: float, max_det: int):
+    """
+    pred: one image's YOLOv8 output (4 + num_classes, N) → person boxes/scores in frame pixels.
+    A candidate counts as a person only when person is its best class (ultralytics classes=[0]).
+    """
+    pred = pred.T
+    class_scores = pred[:, 4:]
+
+    best = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(len(pred)), best]
+    keep = (best == 0) & (scores > conf)
+
+    if not keep.any():
+        return np.zeros((0, 4), dtype=np.float32), np.zeros((0,), dtype=np.float32)
+
+    cxcywh = pred[keep, :4]
+    scores = scores[keep]
+
+    boxes = np.empty_like(cxcywh)
+    boxes[:, 0] = cxcywh[:, 0] - cxcywh[:, 2] / 2
+    boxes[:, 1] = cxcywh[:, 1] - cxcywh[:, 3] / 2
+    boxes[:, 2] = cxcywh[:, 0] + cxcywh[:, 2] / 2
+    boxes[:, 3] = cxcywh[:, 1] + cxcywh[:, 3] / 2
+
+    nms_boxes = np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]])
+    idx = cv2.dnn.NMSBoxes(nms_boxes.tolist(), scores.tolist(), conf, iou, top_k=max_det)
+    idx = np.asarray(idx, dtype=np.int64).reshape(-1)
+
+    boxes = boxes[idx]
+    scores = scores[idx]
+
+    # undo letterbox
+    boxes[:, [0, 2]] -= pad[0]
+    boxes[:, [1, 3]] -= pad[1]
+    boxes /= ratio
+
+    h, w = frame_shape[:2]
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+
+    return boxes.astype(np.float32), scores.astype(np.float32)
+
+
+class OnnxPersonDetector:
+    """
+    YOLOv8 person detector on onnxruntime — no torch/ultralytics at runtime.
+
+    Export the model once with `python -m app.ai.export_person_onnx`.
+    Preprocessing (letterbox, pad 114, RGB, /255) and postprocessing (best-class
+    filter, NMS iou 0.7, max 300 boxes) follow ultralytics predict(), so boxes
+    and scores match the PyTorch backend up to resize rounding.
+    """
+
+    def __init__(self, model_path: str = PERSON_ONNX_MODEL, conf: float = 0.25, imgsz: int = 640):
+        available = ort.get_available_providers()
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+
+        self.session = ort.InferenceSession(model_path, providers=providers)
+        self.conf = conf
+        self.iou = PERSON_NMS_IOU
+        self.max_det = PERSON_MAX_DET
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+
+        _, _, in_h, in_w = model_input.shape
+        self.dynamic = not (isinstance(in_h, int) and isinstance(in_w, int))
+        self.imgsz = imgsz if self.dynamic else int(in_h)
+        self.batch_dynamic = not isinstance(model_input.shape[0], int)
+
+        print(f"[AI] ONNX person detector ready → {model_path} ({self.session.get_providers()[0]})")
+
+    def detect(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns per frame (boxes (N,4) xyxy in frame pixels, scores (N,)).
+        """
+        if not self.batch_dynamic and len(frames) > 1:
+            results = []
+            for frame in frames:
+                results.extend(self.detect_batch([frame]))
+            return results
+
+        shape = _input_shape(frames, self.imgsz, self.dynamic)
+
+        blob = np.empty((len(frames), 3, shape[0], shape[1]), dtype=np.float32)
+        meta = []
+
+        for i, frame in enumerate(frames):
+            image, ratio, pad = letterbox(frame, shape)
+            # BGR HWC uint8 → RGB CHW float 0..1
+            blob[i] = image[:, :, ::-1].transpose(2, 0, 1)
+            meta.append((ratio, pad, frame.shape))
+
+        blob /= 255.0
+
+        output = self.session.run(None, {self.input_name: blob})[0]
+
+        return [
+            decode_person_output(output[i], ratio, pad, frame_shape, self.conf, self.iou, self.max_det)
+            for i, (ratio, pad, frame_shape) in enumerate(meta)
+        ]
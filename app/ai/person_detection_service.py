@@ -0,0 +1,28 @@
+from typing import Tuple
+
+import numpy as np
+
+from app.ai.batch_processor import MicroBatcher, BATCH_SIZE, BATCH_TIMEOUT
+
+
+class PersonDetectionService:
+    """
+    One person detector shared by every camera worker.
+
+    Workers call detect(frame) from their own threads; frames arriving within
+    the batching window are stacked into a single detect_batch() call, so the
+    per-call Python, pre- and post-processing overhead is paid once per batch.
+    With max_batch=1 calls are simply serialized on the detector.
+
+    Returns detections only — tracking stays per camera (ByteTrackerService).
+    """
+
+    def __init__(self, detector, max_batch: int = BATCH_SIZE, max_wait: float = BATCH_TIMEOUT):
+        self.detector = detector
+        self.batcher = MicroBatcher("person", detector.detect_batch, max_batch=max_batch, max_wait=max_wait)
+
+    def detect(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (boxes (N,4) xyxy in frame pixels, scores (N,)).
+        """
+        return self.batcher.infer(frame)
@@ -1,49 +1,61 @@
-from ultralytics import YOLO
+import os
+from typing import List, Tuple
+
 import numpy as np
-import cv2
+
+PERSON_CONF = float(os.getenv("PERSON_CONF", "0.25"))
+PERSON_IMGSZ = int(os.getenv("PERSON_IMGSZ", "640"))
+# "onnx" (onnxruntime), "ultralytics" (PyTorch) or "auto" (onnx when the exported model exists)
+PERSON_DETECTOR_BACKEND = os.getenv("PERSON_DETECTOR_BACKEND", "auto").strip().lower()
+
 
 class PersonDetector:
-    def __init__(self, model_path="yolov8n.pt", imgsz=960):
+    """
+    YOLO person detector on ultralytics/PyTorch — detection only, no tracker state.
+
+    Tracking is per camera (ByteTrackerService), so one detector can serve
+    every camera without track IDs leaking between them.
+    """
+
+    def __init__(self, model_path: str = "yolov8n.pt", conf: float = PERSON_CONF, imgsz: int = PERSON_IMGSZ):
+        # torch + ultralytics are only loaded when this backend is chosen
+        from ultralytics import YOLO
+
         self.model = YOLO(model_path)
+        self.conf = conf
         self.imgsz = imgsz
 
-    def detect(self, frame):
-        h, w = frame.shape[:2]
-        frame_small = self._resize(frame)
-
-        results = self.model(frame_small, conf=0.3, verbose=False)
-
-        small_h, small_w = frame_small.shape[:2]
-        scale_x = w / small_w
-        scale_y = h / small_h
-
-        boxes = []
-        scores = []
-
-        for r in results:
-            for box in r.boxes:
-                cls = int(box.cls[0])
-                if cls != 0:
-                    continue
-
-                x1_s, y1_s, x2_s, y2_s = box.xyxy[0].cpu().numpy()
-                conf = float(box.conf[0])
-
-                x1 = x1_s * scale_x
-                y1 = y1_s * scale_y
-                x2 = x2_s * scale_x
-                y2 = y2_s * scale_y
-
-                boxes.append([x1, y1, x2, y2])
-                scores.append(conf)
-
-        return boxes, scores
-    
-    def _resize(self, frame):
-        h, w = frame.shape[:2]
-        scale = self.imgsz / max(h, w)
-        if scale >= 1:
-            return frame
-        new_w = int(w * scale)
-        new_h = int(h * scale)
-        return cv2.resize(frame, (new_w, new_h))
\ No newline at end of file
+    def detect(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        One model call for all frames (sizes may differ; each is letterboxed).
+        Returns per frame (boxes (N,4) xyxy in frame pixels, scores (N,)).
+        """
+        results = self.model.predict(frames, classes=[0], conf=self.conf, imgsz=self.imgsz, verbose=False)
+
+        return [
+            (
+                r.boxes.xyxy.cpu().numpy().astype(np.float32),
+                r.boxes.conf.cpu().numpy().astype(np.float32),
+            )
+            for r in results
+        ]
+
+
+def create_person_detector(backend: str = PERSON_DETECTOR_BACKEND):
+    """
+    Person detector for the configured backend; both expose detect() / detect_batch().
+    """
+    from app.ai.onnx_person_detector import OnnxPersonDetector, PERSON_ONNX_MODEL
+
+    if backend == "auto":
+        backend = "onnx" if os.path.exists(PERSON_ONNX_MODEL) else "ultralytics"
+        if backend == "ultralytics":
+            print(f"[AI] ⚠️ {PERSON_ONNX_MODEL} not found → using ultralytics (export with: python -m app.ai.export_person_onnx)")
+
+    if backend == "onnx":
+        return OnnxPersonDetector(PERSON_ONNX_MODEL, conf=PERSON_CONF, imgsz=PERSON_IMGSZ)
+
+    return PersonDetector("yolov8n.pt")
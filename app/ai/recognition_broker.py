@@ -0,0 +1,80 @@
+import os
+import threading
+from concurrent.futures import TimeoutError
+from typing import List
+
+import numpy as np
+
+from app.ai.batch_processor import MicroBatcher, BATCH_TIMEOUT, BATCH_RESULT_TIMEOUT
+from app.ai.embedder import FaceEmbedder
+
+# most embed() calls (one per camera frame) per model batch; the live cap is the registered camera count
+RECOGNITION_BATCH_SIZE = int(os.getenv("RECOGNITION_BATCH_SIZE", "32"))
+
+
+class RecognitionBroker(FaceEmbedder):
+    """
+    One embedding model shared by every camera worker.
+
+    Workers hand in a frame's aligned crops from their own threads; each embed()
+    call gets a Future and calls arriving within the batching window go through
+    the model as one embed() call, so onnxruntime runs a few large batches instead
+    of many concurrent small sessions. A worker only waits on its own crops.
+
+    - Workers register()/unregister(); a batch holds at most one call per
+      registered client, so a full round dispatches without waiting out the
+      window. With a single client its crops go straight to the model.
+    - A worker waits at most `timeout` for its batch, then embeds inline.
+
+    Same interface as the wrapped FaceEmbedder (name, align, embed, embed_faces).
+    """
+
+    def __init__(
+        self,
+        embedder: FaceEmbedder,
+        max_batch: int = RECOGNITION_BATCH_SIZE,
+        max_wait: float = BATCH_TIMEOUT,
+        timeout: float = BATCH_RESULT_TIMEOUT,
+    ):
+        self.embedder = embedder
+        self.name = embedder.name
+        self.dim = embedder.dim
+        self.input_size = embedder.input_size
+        self.timeout = timeout
+
+        self.clients = 0
+        self._clients_lock = threading.Lock()
+
+        self.max_batch = max_batch
+        self.batcher = MicroBatcher("recognition", self._run_batch, max_batch=1, max_wait=max_wait)
+
+    def register(self) -> None:
+        with self._clients_lock:
+            self.clients += 1
+            self.batcher.max_batch = max(1, min(self.max_batch, self.clients))
+
+    def unregister(self) -> None:
+        with self._clients_lock:
+            self.clients = max(0, self.clients - 1)
+            self.batcher.max_batch = max(1, min(self.max_batch, self.clients))
+
+    def _run_batch(self, calls: List[List[np.ndarray]]) -> List[np.ndarray]:
+        """
+        One model call for the crops of every embed() call, split back per call.
+        """
+        embeddings = self.embedder.embed([crop for crops in calls for crop in crops])
+        bounds = np.cumsum([len(crops) for crops in calls])[:-1]
+        return np.split(embeddings, bounds)
+
+    def embed(self, crops: List[np.ndarray]) -> np.ndarray:
+        if not crops:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        if self.clients <= 1:
+            return self.embedder.embed(crops)
+
+        try:
+            return self.batcher.infer(list(crops), timeout=self.timeout)
+        except TimeoutError:
+            print(f"[AI] ⚠️ Recognition batch timed out after {self.timeout:.1f}s; embedding {len(crops)} crops inline")
+            return self.embedder.embed(crops)
@@ -1,31 +1,41 @@
+import numpy as np
+
+from app.ai.box_ops import iou_matrix
+
+
 def iou(a, b):
+    """
+    IoU of two xyxy boxes (scalar path; use iou_matrix for many boxes).
+    """
     x1 = max(a[0], b[0])
     y1 = max(a[1], b[1])
     x2 = min(a[2], b[2])
     y2 = min(a[3], b[3])
 
     inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
 
-    area_a = (a[2] - a[0]) * (a[3] - a[1])
-    area_b = (b[2] - b[0]) * (b[3] - b[1])
-
-    union = area_a + area_b - inter
-
-    return inter / union if union > 0 else 0
+    return float(inter / union) if union > 0 else 0.0
 
 def remove_duplicate_detections(detections, threshold=0.8):
-
-    filtered = []
-
-    for d in detections:
-        duplicate = False
-
-        for f in filtered:
-            if iou(d.bbox, f.bbox) > threshold:
-                duplicate = True
-                break
-
-        if not duplicate:
-            filtered.append(d)
-
-    return filtered
\ No newline at end of file
+    """
+    Keeps detections in order, dropping any that overlap an already kept one by more than threshold.
+
+    "Kept" depends only on earlier detections, so the greedy result is the fixed point of
+    kept[i] = not any(overlap[i, j] and kept[j] for j < i); it is reached by whole-matrix
+    updates over the lower triangle (one per level of duplicate chains, usually two).
+    """
+    if len(detections) < 2:
+        return list(detections)
+
+    boxes = [d.bbox for d in detections]
+    earlier = np.tril(iou_matrix(boxes, boxes) > threshold, k=-1)
+
+    kept = np.ones(len(detections), dtype=bool)
+    while True:
+        updated = ~(earlier & kept[None, :]).any(axis=1)
+        if np.array_equal(updated, kept):
+            break
+        kept = updated
+
+    return [d for d, keep in zip(detections, kept) if keep]
@@ -0,0 +1,113 @@
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+ROI_PACK_CANVAS = int(os.getenv("ROI_PACK_CANVAS", "640"))
+# empty border between tiles so a detection never spans two ROIs
+ROI_PACK_GAP = int(os.getenv("ROI_PACK_GAP", "16"))
+
+
+@dataclass
+class Tile:
+    index: int      # position of the ROI in the packed list
+    x: int          # placement on the canvas
+    y: int
+    w: int
+    h: int
+    scale: float    # canvas px per ROI px (<= 1)
+
+    def contains(self, px: float, py: float) -> bool:
+        return self.x <= px < self.x + self.w and self.y <= py < self.y + self.h
+
+    def to_roi(self, points: np.ndarray) -> np.ndarray:
+        """
+        Canvas coordinates → ROI coordinates, for xyxy boxes or (N,2) keypoints.
+        """
+        pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        pts = (pts - (self.x, self.y)) / self.scale
+        return pts.reshape(np.shape(points))
+
+
+class RoiPacker:
+    """
+    Tiles many small ROIs onto a few square canvases (shelf packing, tallest first)
+    so one detector pass covers all of them.
+
+    ROIs larger than the canvas are downscaled to fit; each canvas is cropped to
+    the area actually used so a handful of small ROIs gives a small detector input.
+    """
+
+    def __init__(self, canvas_size: int = ROI_PACK_CANVAS, gap: int = ROI_PACK_GAP):
+        self.canvas_size = canvas_size
+        self.gap = gap
+
+    def layout(self, shapes: List[Tuple[int, int]]) -> List[Tuple[Tuple[int, int], List[Tile]]]:
+        """
+        Placement only, for ROI shapes (h, w): per canvas its used (h, w) and tiles.
+        """
+        size, gap = self.canvas_size, self.gap
+        usable = size - 2 * gap
+
+        layouts = []        # per canvas: list of tiles
+        tiles = []
+        x = y = gap
+        shelf_h = 0
+
+        for index in sorted(range(len(shapes)), key=lambda i: shapes[i][0], reverse=True):
+            h, w = shapes[index][:2]
+            scale = min(1.0, usable / h, usable / w)
+            tw, th = max(1, int(w * scale)), max(1, int(h * scale))
+
+            if x + tw + gap > size:
+                x = gap
+                y += shelf_h + gap
+                shelf_h = 0
+
+            if y + th + gap > size:
+                layouts.append(tiles)
+                tiles = []
+                x = y = gap
+                shelf_h = 0
+
+            tiles.append(Tile(index, x, y, tw, th, tw / w))
+            x += tw + gap
+            shelf_h = max(shelf_h, th)
+
+        if tiles:
+            layouts.append(tiles)
+
+        return [
+            ((max(t.y + t.h for t in tiles) + gap, max(t.x + t.w for t in tiles) + gap), tiles)
+            for tiles in layouts
+        ]
+
+    def pack(self, rois: List[np.ndarray]) -> List[Tuple[np.ndarray, List[Tile]]]:
+        packed = []
+        for (used_h, used_w), tiles in self.layout([roi.shape[:2] for roi in rois]):
+            canvas = np.zeros((used_h, used_w, 3), dtype=np.uint8)
+
+            for t in tiles:
+                roi = rois[t.index]
+                if t.scale < 1.0:
+                    roi = cv2.resize(roi, (t.w, t.h), interpolation=cv2.INTER_AREA)
+                canvas[t.y:t.y + t.h, t.x:t.x + t.w] = roi[:t.h, :t.w]
+
+            packed.append((canvas, tiles))
+
+        return packed
+
+    @staticmethod
+    def tile_for(tiles: List[Tile], bbox) -> Optional[Tile]:
+        """
+        Tile holding the centre of a detected box (None if it fell into a gap).
+        """
+        cx = (bbox[0] + bbox[2]) / 2
+        cy = (bbox[1] + bbox[3]) / 2
+
+        for t in tiles:
+            if t.contains(cx, cy):
+                return t
+        return None
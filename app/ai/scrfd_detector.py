@@ -0,0 +1,220 @@
+import os
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCRFD_MODEL = os.getenv(
+    "SCRFD_MODEL",
+    os.path.abspath(os.path.join(BASE_DIR, "../../models/scrfd/scrfd_10g_bnkps.onnx"))
+)
+SCRFD_NMS_THRESHOLD = float(os.getenv("SCRFD_NMS_THRESHOLD", "0.4"))
+
+# output layouts of the released SCRFD models: outputs → (feature maps, strides, anchors per cell, keypoints)
+_LAYOUTS = {
+    6: (3, [8, 16, 32], 2, False),
+    9: (3, [8, 16, 32], 2, True),
+    10: (5, [8, 16, 32, 64, 128], 1, False),
+    15: (5, [8, 16, 32, 64, 128], 1, True),
+}
+
+
+class ScrfdDetector:
+    """
+    SCRFD face detector on its own onnxruntime session (no insightface model zoo).
+
+    - detect(img, input_size, max_num, metric) → (bboxes (N,5) [x1,y1,x2,y2,score], kpss (N,5,2) | None),
+      a drop-in for insightface's SCRFD.detect.
+    - detect_batch(imgs, input_size) runs one session call when the model has a
+      batch axis, else one call per image.
+    - detect_faces(img, offset) → result dicts shaped like
+      InsightFaceEngine.detect_and_generate_embedding (no embedding/pose/age/gender).
+
+    Anchor centres are cached per (feature height, width, stride); box and keypoint
+    decoding is vectorized over all anchors of all images.
+    """
+
+    def __init__(
+        self,
+        model_path: str = SCRFD_MODEL,
+        det_thresh: float = 0.5,
+        nms_thresh: float = SCRFD_NMS_THRESHOLD,
+        input_size: Tuple[int, int] = (640, 640),
+    ):
+        available = ort.get_available_providers()
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+
+        self.session = ort.InferenceSession(model_path, providers=providers)
+        self.det_thresh = det_thresh
+        self.nms_thresh = nms_thresh
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_names = [o.name for o in self.session.get_outputs()]
+
+        batch, _, in_h, in_w = model_input.shape
+        self.batched = not isinstance(batch, int)
+        # fixed-shape exports only run at their own size
+        self.fixed_size = (in_w, in_h) if isinstance(in_h, int) and isinstance(in_w, int) else None
+        self.input_size = self.fixed_size or tuple(input_size)
+
+        layout = _LAYOUTS.get(len(self.output_names))
+        if layout is None:
+            raise ValueError(f"Unsupported SCRFD model: {len(self.output_names)} outputs")
+        self.fmc, self.strides, self.num_anchors, self.use_kps = layout
+
+        self._center_cache = {}
+
+        print(f"[AI] SCRFD detector ready → {model_path} ({self.session.get_providers()[0]})")
+
+    # -----------------------------
+    # PUBLIC
+    # -----------------------------
+    def detect(self, img: np.ndarray, input_size: Optional[Tuple[int, int]] = None, max_num: int = 0, metric: str = "default"):
+        det, kpss = self.detect_batch([img], input_size)[0]
+
+        if max_num > 0 and det.shape[0] > max_num:
+            det, kpss = self._top(det, kpss, img.shape, max_num, metric)
+
+        return det, kpss
+
+    def detect_batch(self, imgs: List[np.ndarray], input_size: Optional[Tuple[int, int]] = None):
+        input_size = self.fixed_size or tuple(input_size or self.input_size)
+
+        if not self.batched and len(imgs) > 1:
+            return [self.detect_batch([img], input_size)[0] for img in imgs]
+
+        blob, scales = self._preprocess(imgs, input_size)
+        outputs = self.session.run(self.output_names, {self.input_name: blob})
+
+        scores, boxes, kpss = self._decode(outputs, len(imgs), input_size)
+
+        return [self._finish(scores[i], boxes[i], kpss[i] if kpss is not None else None, scales[i]) for i in range(len(imgs))]
+
+    def detect_faces(self, img: np.ndarray, offset=(0, 0), input_size: Optional[Tuple[int, int]] = None) -> list:
+        bboxes, kpss = self.detect(img, input_size)
+        x_offset, y_offset = offset
+
+        results = []
+        for i in range(bboxes.shape[0]):
+            bbox = bboxes[i, :4].astype(np.int32)
+            results.append({
+                "bbox": bbox + np.array([x_offset, y_offset, x_offset, y_offset]),
+                "score": float(bboxes[i, 4]),
+                "landmarks": (kpss[i] + (x_offset, y_offset)).astype(np.int32) if kpss is not None else None,
+                "embedding": None,
+                "pose": None,
+                "age": None,
+                "gender": None
+            })
+
+        return results
+
+    # -----------------------------
+    # INTERNAL
+    # -----------------------------
+    def _preprocess(self, imgs, input_size):
+        """
+        Aspect-preserving resize into the top-left of the input (insightface layout),
+        (x - 127.5) / 128, BGR → RGB, NCHW.
+        """
+        in_w, in_h = input_size
+        canvas = np.zeros((len(imgs), in_h, in_w, 3), dtype=np.uint8)
+        scales = []
+
+        for i, img in enumerate(imgs):
+            h, w = img.shape[:2]
+            scale = min(in_h / h, in_w / w)
+            new_w, new_h = max(1, int(w * scale)), max(1, int(h * scale))
+
+            canvas[i, :new_h, :new_w] = cv2.resize(img, (new_w, new_h))
+            scales.append(new_h / h)
+
+        blob = canvas[..., ::-1].transpose(0, 3, 1, 2).astype(np.float32)
+        blob -= 127.5
+        blob /= 128.0
+        return blob, scales
+
+    def _anchor_centers(self, height: int, width: int, stride: int) -> np.ndarray:
+        key = (height, width, stride)
+        centers = self._center_cache.get(key)
+
+        if centers is None:
+            centers = np.stack(np.mgrid[:height, :width][::-1], axis=-1).astype(np.float32)
+            centers = (centers * stride).reshape(-1, 2)
+            if self.num_anchors > 1:
+                centers = np.repeat(centers, self.num_anchors, axis=0)
+            self._center_cache[key] = centers
+
+        return centers
+
+    def _decode(self, outputs, batch: int, input_size):
+        """
+        All strides at once → scores (B,A), boxes (B,A,4), kpss (B,A,5,2) in input pixels.
+        """
+        in_w, in_h = input_size
+        all_scores, all_boxes, all_kps = [], [], []
+
+        for idx, stride in enumerate(self.strides):
+            scores = outputs[idx]
+            distances = outputs[idx + self.fmc] * stride
+            # exports without a batch axis give (A, C)
+            scores = scores.reshape(batch, -1)
+            distances = distances.reshape(batch, -1, 4)
+
+            centers = self._anchor_centers(in_h // stride, in_w // stride, stride)
+
+            boxes = np.concatenate([centers - distances[..., :2], centers + distances[..., 2:]], axis=-1)
+
+            all_scores.append(scores)
+            all_boxes.append(boxes)
+
+            if self.use_kps:
+                kps = (outputs[idx + self.fmc * 2] * stride).reshape(batch, -1, 5, 2)
+                all_kps.append(kps + centers[None, :, None, :])
+
+        scores = np.concatenate(all_scores, axis=1)
+        boxes = np.concatenate(all_boxes, axis=1)
+        kpss = np.concatenate(all_kps, axis=1) if self.use_kps else None
+        return scores, boxes, kpss
+
+    def _top(self, det, kpss, image_shape, max_num: int, metric: str):
+        """
+        insightface's max_num cut: largest boxes first ("max"), or by default
+        largest and closest to the image centre (area - 2 * squared centre offset).
+        """
+        area = (det[:, 2] - det[:, 0]) * (det[:, 3] - det[:, 1])
+
+        if metric == "max":
+            values = area
+        else:
+            center_y, center_x = image_shape[0] // 2, image_shape[1] // 2
+            offset_x = (det[:, 0] + det[:, 2]) / 2 - center_x
+            offset_y = (det[:, 1] + det[:, 3]) / 2 - center_y
+            values = area - (offset_x ** 2 + offset_y ** 2) * 2.0
+
+        idx = np.argsort(values)[::-1][:max_num]
+        return det[idx], (kpss[idx] if kpss is not None else None)
+
+    def _finish(self, scores, boxes, kpss, scale):
+        keep = scores >= self.det_thresh
+        empty = (np.zeros((0, 5), dtype=np.float32), np.zeros((0, 5, 2), dtype=np.float32) if self.use_kps else None)
+        if not keep.any():
+            return empty
+
+        scores = scores[keep]
+        boxes = boxes[keep] / scale
+        kpss = kpss[keep] / scale if kpss is not None else None
+
+        xywh = np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]])
+        idx = cv2.dnn.NMSBoxes(xywh.tolist(), scores.tolist(), self.det_thresh, self.nms_thresh)
+        idx = np.asarray(idx, dtype=np.int64).reshape(-1)
+
+        # highest score first, like insightface
+        idx = idx[np.argsort(-scores[idx], kind="stable")]
+
+        det = np.column_stack([boxes[idx], scores[idx]]).astype(np.float32)
+        return det, (kpss[idx].astype(np.float32) if kpss is not None else None)
@@ -1,15 +1,30 @@
+import os
+
 import supervision as sv
 import numpy as np
 
+# supervision's minimum_matching_threshold is a cost (1 - IoU) bound: 0.8 accepts IoU > 0.2.
+# Decimated ai_fps (and detect_every) moves people further between updates, so keep it loose.
+TRACK_MATCH_THRESHOLD = float(os.getenv("TRACK_MATCH_THRESHOLD", "0.8"))
+
 
 class ByteTrackerService:
+    """
+    Per-camera ByteTrack wrapper.
+
+    Between detector runs, predict() extrapolates the tracks reported by the
+    last update() with a constant-velocity model (velocity per processed frame,
+    measured between the last two updates); ByteTrack's own state is untouched.
+    """
+
     def __init__(
         self,
         frame_rate: int = 15,   # MUST match actual processing FPS
         track_activation_threshold: float = 0.25,
         lost_track_buffer: int = 60,     # slightly more tolerant
-        minimum_matching_threshold: float = 0.3
+        minimum_matching_threshold: float = TRACK_MATCH_THRESHOLD
     ):
+        self.track_activation_threshold = track_activation_threshold
         self.tracker = sv.ByteTrack(
             track_activation_threshold=track_activation_threshold,
             lost_track_buffer=lost_track_buffer,
@@ -17,6 +32,9 @@ class ByteTrackerService:
             frame_rate=frame_rate
         )
 
+        self._tracks = {}           # tid -> (bbox, score, velocity) from the last update
+        self._frames_since_update = 0
+
     def update(self, boxes, scores):
         """
         boxes: list or np.ndarray of shape (N,4)
@@ -42,15 +60,53 @@ class ByteTrackerService:
 
         tracked = self.tracker.update_with_detections(detections)
 
+        confidence = tracked.confidence
+        if confidence is None:
+            confidence = np.ones(len(tracked), dtype=np.float32)
+
+        elapsed = self._frames_since_update + 1
+        self._frames_since_update = 0
+
         results = []
+        tracks = {}
 
-        for bbox, tid in zip(tracked.xyxy, tracked.tracker_id):
+        for bbox, tid, score in zip(tracked.xyxy, tracked.tracker_id, confidence):
             if tid is None:
                 continue
 
-            results.append((int(tid), bbox.astype(np.float32)))
+            tid = int(tid)
+            bbox = bbox.astype(np.float32)
+
+            previous = self._tracks.get(tid)
+            velocity = (bbox - previous[0]) / elapsed if previous is not None else np.zeros(4, dtype=np.float32)
 
+            tracks[tid] = (bbox, float(score), velocity)
+            results.append((tid, bbox))
+
+        self._tracks = tracks
         return results
 
+    def predict(self):
+        """
+        Boxes for the current frame without a detector run: [(tid, bbox)].
+        """
+        self._frames_since_update += 1
+        steps = self._frames_since_update
+
+        return [
+            (tid, bbox + velocity * steps)
+            for tid, (bbox, _, velocity) in self._tracks.items()
+        ]
+
+    def min_score(self):
+        """
+        Lowest detection score among the last update's tracks (None if there are none).
+        """
+        if not self._tracks:
+            return None
+        return min(score for _, score, _ in self._tracks.values())
+
     def reset(self):
-        self.tracker.reset()
\ No newline at end of file
+        self.tracker.reset()
+        self._tracks = {}
+        self._frames_since_update = 0
\ No newline at end of file
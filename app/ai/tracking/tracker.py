@@ -1,6 +1,7 @@
 import numpy as np
 import time
 from typing import List
+from app.ai.box_ops import iou_matrix, linear_assignment
 from .track import Track
 
 
@@ -13,28 +14,37 @@ class SimpleTracker:
         self.iou_threshold = iou_threshold
 
     def update(self, detections: List[np.ndarray], timestamp: float):
-
+        """
+        One-to-one IoU matching (Hungarian via lap) of detections to live tracks;
+        unmatched detections start new tracks.
+        """
         updated_tracks = []
 
-        for det in detections:
-            matched = False
-
-            for track in self.tracks:
-                if self._iou(track.bbox, det) > self.iou_threshold:
-                    track.update(det, timestamp)
-                    updated_tracks.append(track)
-                    matched = True
-                    break
-
-            if not matched:
-                track = Track(
-                    track_id=self.next_id,
-                    bbox=det,
-                    last_seen=timestamp
-                )
-                self.next_id += 1
-                self.tracks.append(track)
-                updated_tracks.append(track)
+        track_boxes = [t.bbox for t in self.tracks]
+        iou = iou_matrix(track_boxes, detections)
+
+        # pairs at or below the IoU threshold are never matched
+        matches, _, unmatched_dets = linear_assignment(1.0 - iou, max_cost=1.0 - self.iou_threshold)
+
+        for t_idx, d_idx in matches:
+            if iou[t_idx, d_idx] <= self.iou_threshold:
+                unmatched_dets = np.append(unmatched_dets, d_idx)
+                continue
+
+            track = self.tracks[t_idx]
+            track.update(detections[d_idx], timestamp)
+            updated_tracks.append(track)
+
+        for d_idx in sorted(unmatched_dets):
+            det = detections[d_idx]
+            track = Track(
+                track_id=self.next_id,
+                bbox=det,
+                last_seen=timestamp
+            )
+            self.next_id += 1
+            self.tracks.append(track)
+            updated_tracks.append(track)
 
         self._cleanup(timestamp)
 
@@ -45,18 +55,3 @@ class SimpleTracker:
             t for t in self.tracks
             if (timestamp - t.last_seen) < self.max_age
         ]
-
-    def _iou(self, boxA, boxB):
-        xA = max(boxA[0], boxB[0])
-        yA = max(boxA[1], boxB[1])
-        xB = min(boxA[2], boxB[2])
-        yB = min(boxA[3], boxB[3])
-
-        inter = max(0, xB - xA) * max(0, yB - yA)
-
-        areaA = (boxA[2] - boxA[0]) * (boxA[3] - boxA[1])
-        areaB = (boxB[2] - boxB[0]) * (boxB[3] - boxB[1])
-
-        union = areaA + areaB - inter + 1e-6
-
-        return inter / union
@@ -111,6 +111,7 @@ async def register_face(files: List[UploadFile] = File(...)):
         ],
 
         "mean_embedding": mean_embedding.tolist(),
+        "embedding_model": insight_engine.embedder.name,
 
         "meta": faces_meta
     }
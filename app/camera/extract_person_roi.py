@@ -36,4 +36,31 @@ def extract_person_roi(frame, person_id, bbox, pad=40):
     if roi.size == 0:
         return None
 
-    return person_id, roi, (x1, y1)
\ No newline at end of file
+    return person_id, roi, (x1, y1)
+
+# Standing person (box h/w ≈ HEAD_ROI_STANDING_ASPECT): face lies in the top HEAD_ROI_FRACTION.
+HEAD_ROI_FRACTION = 0.35
+HEAD_ROI_STANDING_ASPECT = 2.6
+
+
+def head_fraction(bbox) -> float:
+    """
+    Share of the person box (from the top) that holds the head.
+    Shorter boxes (upper body only, close to the camera, cut by the frame edge)
+    get a larger share; square-ish boxes keep the whole box.
+    """
+    x1, y1, x2, y2 = bbox
+    aspect = (y2 - y1) / max(x2 - x1, 1)
+
+    return float(min(1.0, max(HEAD_ROI_FRACTION, HEAD_ROI_FRACTION * HEAD_ROI_STANDING_ASPECT / max(aspect, 1e-6))))
+
+
+def extract_head_roi(frame, person_id, bbox, pad=40):
+    """
+    Like extract_person_roi, but only the head region of the person box
+    (top slice sized by head_fraction). Same return value.
+    """
+    x1, y1, x2, y2 = bbox
+    y2 = y1 + (y2 - y1) * head_fraction(bbox)
+
+    return extract_person_roi(frame, person_id, [x1, y1, x2, y2], pad=pad)
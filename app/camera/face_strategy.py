@@ -0,0 +1,117 @@
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# largest single detector input for the region path; bigger regions would be downscaled → ROI path
+FACE_REGION_MAX_SIZE = int(os.getenv("FACE_REGION_MAX_SIZE", "1280"))
+# region path must be this much cheaper than the ROI path to be picked (<1 favours ROIs)
+FACE_REGION_BIAS = float(os.getenv("FACE_REGION_BIAS", "1.0"))
+SPATIAL_GRID_CELL = int(os.getenv("SPATIAL_GRID_CELL", "128"))
+
+_STRIDE = 32
+
+
+@dataclass
+class FaceStrategy:
+    name: str                                           # "roi" or "region"
+    roi_cost: int                                       # detector pixels, per-ROI path
+    region_cost: int                                    # detector pixels, one region pass
+    region: Optional[Tuple[int, int, int, int]] = None  # x1, y1, x2, y2 (region path)
+    det_size: Optional[int] = None                      # square detector input (region path)
+
+
+def choose_face_strategy(
+    roi_rects: List[Tuple[int, int, int, int]],
+    region_rects: List[Tuple[int, int, int, int]],
+    roi_cost_fn: Optional[Callable[[List[Tuple[int, int]]], int]] = None,
+) -> FaceStrategy:
+    """
+    Per-ROI detection vs one detection over the region holding every person.
+
+    Detector cost ~ input pixels: the ROI path pays for the inputs its ROIs run at
+    (roi_cost_fn(shapes) → pixels, e.g. padded det sizes or packed canvases; raw ROI
+    area without one), the region path for one square input covering the union of
+    the person boxes at native resolution. The region is never downscaled: if it
+    does not fit FACE_REGION_MAX_SIZE the ROI path is used.
+    """
+    shapes = [(y2 - y1, x2 - x1) for x1, y1, x2, y2 in roi_rects]
+    roi_cost = int(roi_cost_fn(shapes)) if roi_cost_fn is not None else int(sum(h * w for h, w in shapes))
+
+    if len(region_rects) < 2:
+        return FaceStrategy("roi", roi_cost, 0)
+
+    rects = np.asarray(region_rects)
+    x1, y1 = int(rects[:, 0].min()), int(rects[:, 1].min())
+    x2, y2 = int(rects[:, 2].max()), int(rects[:, 3].max())
+
+    longest = max(x2 - x1, y2 - y1)
+    det_size = int(np.ceil(longest / _STRIDE) * _STRIDE)
+    region_cost = det_size * det_size
+
+    if det_size > FACE_REGION_MAX_SIZE or region_cost >= roi_cost * FACE_REGION_BIAS:
+        return FaceStrategy("roi", roi_cost, region_cost)
+
+    return FaceStrategy("region", roi_cost, region_cost, (x1, y1, x2, y2), det_size)
+
+
+class SpatialGrid:
+    """
+    Uniform grid over boxes for point → box lookups (faces → person tracks).
+    """
+
+    def __init__(self, cell: int = SPATIAL_GRID_CELL):
+        self.cell = cell
+        self.cells = defaultdict(list)
+        self.boxes = {}
+
+    def insert(self, key, box) -> None:
+        self.boxes[key] = box
+        x1, y1, x2, y2 = (int(v // self.cell) for v in box)
+
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                self.cells[(cx, cy)].append(key)
+
+    def query(self, x: float, y: float) -> list:
+        """
+        Keys of the boxes containing (x, y).
+        """
+        candidates = self.cells.get((int(x // self.cell), int(y // self.cell)), [])
+        return [
+            key for key in candidates
+            if self.boxes[key][0] <= x <= self.boxes[key][2] and self.boxes[key][1] <= y <= self.boxes[key][3]
+        ]
+
+
+def assign_faces_to_tracks(faces: List[dict], person_boxes: Dict[int, np.ndarray], head_share: float = 0.15) -> Dict[int, List[dict]]:
+    """
+    Faces (frame coordinates) → the person box that contains the face centre; when
+    boxes overlap, the one whose expected head point (top centre, head_share down)
+    is closest wins. Faces outside every person box are dropped.
+    """
+    grid = SpatialGrid()
+    for person_id, box in person_boxes.items():
+        grid.insert(person_id, box)
+
+    faces_by_track = defaultdict(list)
+
+    for face in faces:
+        fx1, fy1, fx2, fy2 = face["bbox"]
+        cx, cy = (fx1 + fx2) / 2, (fy1 + fy2) / 2
+
+        best, best_dist = None, None
+        for person_id in grid.query(cx, cy):
+            x1, y1, x2, y2 = person_boxes[person_id]
+            head_x, head_y = (x1 + x2) / 2, y1 + (y2 - y1) * head_share
+            dist = (cx - head_x) ** 2 + (cy - head_y) ** 2
+
+            if best_dist is None or dist < best_dist:
+                best, best_dist = person_id, dist
+
+        if best is not None:
+            faces_by_track[best].append(face)
+
+    return dict(faces_by_track)
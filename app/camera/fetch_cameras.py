@@ -1,5 +1,6 @@
+import json
 import requests
-from typing import List
+from typing import Any, Dict, List
 from urllib.parse import quote, urlsplit
 
 from app.config.config import envConfig
@@ -9,6 +10,7 @@ from .types import CameraConfig
 
 
 CAMERA_API_URL = envConfig.CAMERA_API_URL
+CAMERA_MANIFEST = envConfig.CAMERA_MANIFEST
 
 def normalize_rtsp(rtsp_url: str, username: str, password: str) -> str:
     """
@@ -35,21 +37,44 @@ def normalize_rtsp(rtsp_url: str, username: str, password: str) -> str:
     return rebuilt
 
 
+def load_camera_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Read cameras from a local JSON file instead of the camera API.
+    Accepts either the API payload ({"success": true, "data": [...]}) or a plain list.
+    Sources can be rtsp://, "webcam" or file:// recordings (see app.capture.replay).
+    """
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Failed to read camera manifest {path}: {e}")
+
+    if isinstance(payload, list):
+        return payload
+
+    return payload.get("data", [])
+
+
 def fetch_cameras() -> List[CameraConfig]:
     print("[Server] Fetching camera configs...")
 
-    try:
-        res = requests.get(CAMERA_API_URL, timeout=10)
-        res.raise_for_status()
-    except requests.RequestException as e:
-        raise RuntimeError(f"Failed to fetch cameras: {e}")
+    if CAMERA_MANIFEST:
+        print(f"[Server] Using camera manifest → {CAMERA_MANIFEST}")
+        cameras = load_camera_manifest(CAMERA_MANIFEST)
+    else:
+        try:
+            res = requests.get(CAMERA_API_URL, timeout=10)
+            res.raise_for_status()
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to fetch cameras: {e}")
+
+        payload = res.json()
 
-    payload = res.json()
+        if not payload.get("success"):
+            raise RuntimeError("Camera API returned success=false")
 
-    if not payload.get("success"):
-        raise RuntimeError("Camera API returned success=false")
+        cameras = payload.get("data", [])
 
-    cameras = payload.get("data", [])
     enabled_cameras = [c for c in cameras if c.get("enabled")]
 
     # Webcam mode should run a single local source, not one thread per DB camera.
@@ -75,6 +100,8 @@ def fetch_cameras() -> List[CameraConfig]:
             print(f"[Server] Skipping invalid camera config (missing rtspUrl): {cam}")
             continue
 
+        sub_rtsp_url = None
+
         # If global override is set, always use local webcam
         if getattr(envConfig, "USE_WEBCAM", False):
             rtsp_url = "webcam"
@@ -84,6 +111,8 @@ def fetch_cameras() -> List[CameraConfig]:
             raw_rtsp = cam.get("rtspUrl")
             if isinstance(raw_rtsp, str) and raw_rtsp.strip().lower() == "webcam":
                 rtsp_url = "webcam"
+            elif isinstance(raw_rtsp, str) and raw_rtsp.strip().lower().startswith("file://"):
+                rtsp_url = raw_rtsp.strip()
             else:
                 rtsp_url = normalize_rtsp(
                     raw_rtsp,
@@ -91,6 +120,16 @@ def fetch_cameras() -> List[CameraConfig]:
                     creds.get("password", "")
                 )
 
+            raw_sub_rtsp = cam.get("subRtspUrl") or cam.get("streamConfig", {}).get("subRtspUrl")
+            if rtsp_url.startswith("file://") and isinstance(raw_sub_rtsp, str) and raw_sub_rtsp.strip():
+                sub_rtsp_url = raw_sub_rtsp.strip()
+            elif rtsp_url != "webcam" and isinstance(raw_sub_rtsp, str) and raw_sub_rtsp.strip():
+                sub_rtsp_url = normalize_rtsp(
+                    raw_sub_rtsp,
+                    creds.get("username", ""),
+                    creds.get("password", "")
+                )
+
         config = CameraConfig(
             code=cam["code"],
             name=cam.get("name", ""),
@@ -99,13 +138,17 @@ def fetch_cameras() -> List[CameraConfig]:
             rtsp_url=rtsp_url,
             ai_fps=cam.get("streamConfig", {}).get("aiFps", 10),
             roi=cam.get("roi", {}),
+            # JSON booleans or strings ("false" must stay False), parsed like the env flags
+            motion_gate=str(cam.get("streamConfig", {}).get("motionGate", envConfig.MOTION_GATE)).lower() in ("1", "true", "yes"),
+            detect_every=max(1, int(cam.get("streamConfig", {}).get("detectEvery", envConfig.DETECT_EVERY))),
+            sub_rtsp_url=sub_rtsp_url,
         )
 
 
         final_configs.append(config)
 
         # Log without password
-        print(f"  → {config.code} ({config.gate_type})")
+        print(f"  → {config.code} ({config.gate_type}){' [dual-stream]' if sub_rtsp_url else ''}")
 
     return final_configs
 
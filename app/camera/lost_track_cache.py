@@ -0,0 +1,98 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.camera.types import TrackState
+
+RELINK_TTL_SEC = float(os.getenv("RELINK_TTL_SEC", "3.0"))
+# max centre distance, in heights of the lost person's box, from where they were (or were heading)
+RELINK_GATE = float(os.getenv("RELINK_GATE", "1.0"))
+RELINK_MIN_SIMILARITY = float(os.getenv("RELINK_MIN_SIMILARITY", "0.5"))
+
+
+@dataclass
+class LostTrack:
+    track_id: int
+    bbox: np.ndarray            # last seen box (xyxy)
+    velocity: np.ndarray        # px/sec per box coordinate
+    lost_at: float              # frame timestamp (sec) of the last sighting
+    state: TrackState           # MATCHED_KNOWN or UPDATING_UNKNOWN
+    identity: str               # employee id or unknown id
+    ref_embedding: np.ndarray
+    unknown_meta: Optional[Dict[str, Any]] = field(default=None)
+
+
+class LostTrackCache:
+    """
+    Per-camera cache of recently vanished tracks whose identity was already resolved.
+
+    When the tracker hands out a new ID for the same person (occlusion, ID switch),
+    a new track inherits the old identity if:
+    - it is seen within `ttl` seconds of the old track's last sighting,
+    - its centre is close to where the old track was or was heading (constant velocity),
+    - one face embedding agrees with the old track's reference embedding.
+    """
+
+    def __init__(self, ttl: float = RELINK_TTL_SEC, gate: float = RELINK_GATE, min_similarity: float = RELINK_MIN_SIMILARITY):
+        self.ttl = ttl
+        self.gate = gate
+        self.min_similarity = min_similarity
+
+        self.entries: Dict[int, LostTrack] = {}
+
+    def add(self, entry: LostTrack) -> None:
+        self.entries[entry.track_id] = entry
+
+    def discard(self, track_id: int) -> None:
+        self.entries.pop(track_id, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def empty(self) -> bool:
+        return not self.entries
+
+    def prune(self, now: float) -> None:
+        for tid in [t for t, e in self.entries.items() if now - e.lost_at > self.ttl]:
+            del self.entries[tid]
+
+    def candidates(self, bbox: np.ndarray, now: float) -> List[LostTrack]:
+        """
+        Lost tracks whose position/time gate admits a person at `bbox` now.
+        """
+        self.prune(now)
+
+        centre = (bbox[:2] + bbox[2:]) / 2
+        result = []
+
+        for entry in self.entries.values():
+            dt = now - entry.lost_at
+            last_centre = (entry.bbox[:2] + entry.bbox[2:]) / 2
+            predicted = entry.bbox + entry.velocity * dt
+            predicted_centre = (predicted[:2] + predicted[2:]) / 2
+
+            radius = self.gate * max(entry.bbox[3] - entry.bbox[1], 1.0)
+            distance = min(np.linalg.norm(centre - last_centre), np.linalg.norm(centre - predicted_centre))
+
+            if distance <= radius:
+                result.append(entry)
+
+        return result
+
+    def match(self, bbox: np.ndarray, embedding: np.ndarray, now: float) -> Optional[LostTrack]:
+        """
+        Best gated lost track whose reference embedding agrees; removed from the cache.
+        """
+        best, best_sim = None, self.min_similarity
+
+        for entry in self.candidates(bbox, now):
+            sim = float(np.dot(embedding, entry.ref_embedding))
+            if sim >= best_sim:
+                best, best_sim = entry, sim
+
+        if best is not None:
+            del self.entries[best.track_id]
+
+        return best
@@ -0,0 +1,77 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+MOTION_GATE_WIDTH = int(os.getenv("MOTION_GATE_WIDTH", "160"))
+MOTION_GATE_PIXEL_THRESHOLD = int(os.getenv("MOTION_GATE_PIXEL_THRESHOLD", "18"))
+MOTION_GATE_MIN_AREA = float(os.getenv("MOTION_GATE_MIN_AREA", "0.003"))
+MOTION_GATE_LEARNING_RATE = float(os.getenv("MOTION_GATE_LEARNING_RATE", "0.05"))
+MOTION_GATE_HEARTBEAT_SEC = float(os.getenv("MOTION_GATE_HEARTBEAT_SEC", "5.0"))
+
+
+class MotionGate:
+    """
+    Decides per frame whether the detection pipeline needs to run.
+
+    - Frame is subsampled to ~MOTION_GATE_WIDTH px wide and compared against a
+      running-average background (cv2.accumulateWeighted).
+    - Motion = fraction of changed pixels >= min_area.
+    - Never closes while tracks are active (tracker must keep seeing frames).
+    - Heartbeat: lets one frame through every `heartbeat` seconds regardless.
+    """
+
+    def __init__(
+        self,
+        width: int = MOTION_GATE_WIDTH,
+        pixel_threshold: int = MOTION_GATE_PIXEL_THRESHOLD,
+        min_area: float = MOTION_GATE_MIN_AREA,
+        learning_rate: float = MOTION_GATE_LEARNING_RATE,
+        heartbeat: float = MOTION_GATE_HEARTBEAT_SEC,
+    ):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.learning_rate = learning_rate
+        self.heartbeat = heartbeat
+
+        self._background = None
+        self._last_run = 0.0
+
+        self.frames_seen = 0
+        self.frames_skipped = 0
+
+    def _downsample(self, frame: np.ndarray) -> np.ndarray:
+        step = max(1, frame.shape[1] // self.width)
+        small = cv2.cvtColor(frame[::step, ::step], cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def motion_area(self, frame: np.ndarray) -> float:
+        """
+        Fraction of pixels that differ from the background; updates the background.
+        """
+        small = self._downsample(frame)
+
+        if self._background is None or self._background.shape != small.shape:
+            self._background = small.astype(np.float32)
+            return 1.0
+
+        diff = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+        area = float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+
+        cv2.accumulateWeighted(small, self._background, self.learning_rate)
+        return area
+
+    def should_run(self, frame: np.ndarray, active_tracks: bool = False, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        self.frames_seen += 1
+
+        moving = self.motion_area(frame) >= self.min_area
+
+        if moving or active_tracks or now - self._last_run >= self.heartbeat:
+            self._last_run = now
+            return True
+
+        self.frames_skipped += 1
+        return False
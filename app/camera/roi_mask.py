@@ -0,0 +1,127 @@
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class CameraRoi:
+    """
+    Region of interest from CameraConfig.roi, turned into a crop + mask.
+
+    Accepted formats (pixel or normalised 0..1 coordinates):
+    - {"type": "rect", "x": .., "y": .., "width": .., "height": ..}
+    - {"x1": .., "y1": .., "x2": .., "y2": ..}
+    - {"type": "polygon", "points": [[x, y], ...]}  (or [{"x": .., "y": ..}, ...])
+
+    Empty or unparsable ROI → full frame (apply() returns the frame untouched).
+    The crop rectangle and mask are built once per frame resolution.
+    """
+
+    def __init__(self, roi: Optional[Dict[str, Any]]):
+        self.points = self._parse(roi or {})
+        self.normalized = self.points is not None and bool(np.all(self.points <= 1.0))
+
+        self._size = None
+        self._rect = None
+        self._mask = None
+        self._buffer = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.points is not None
+
+    # -----------------------------
+    # PARSING
+    # -----------------------------
+    @staticmethod
+    def _parse(roi: Dict[str, Any]) -> Optional[np.ndarray]:
+        try:
+            points = roi.get("points") or roi.get("polygon")
+            if points:
+                pts = [(p["x"], p["y"]) if isinstance(p, dict) else (p[0], p[1]) for p in points]
+                if len(pts) < 3:
+                    return None
+                return np.array(pts, dtype=np.float32)
+
+            if all(k in roi for k in ("x1", "y1", "x2", "y2")):
+                x1, y1, x2, y2 = (float(roi[k]) for k in ("x1", "y1", "x2", "y2"))
+            elif all(k in roi for k in ("x", "y", "width", "height")):
+                x1, y1 = float(roi["x"]), float(roi["y"])
+                x2, y2 = x1 + float(roi["width"]), y1 + float(roi["height"])
+            else:
+                return None
+
+            return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.float32)
+
+        except (TypeError, ValueError, KeyError, IndexError):
+            print(f"[Camera] Ignoring invalid roi config: {roi}")
+            return None
+
+    # -----------------------------
+    # BUILD (once per resolution)
+    # -----------------------------
+    def _build(self, frame_w: int, frame_h: int) -> None:
+        self._size = (frame_w, frame_h)
+
+        pts = self.points.copy()
+        if self.normalized:
+            pts[:, 0] *= frame_w
+            pts[:, 1] *= frame_h
+
+        pts[:, 0] = np.clip(pts[:, 0], 0, frame_w)
+        pts[:, 1] = np.clip(pts[:, 1], 0, frame_h)
+
+        x1, y1 = np.floor(pts.min(axis=0)).astype(int)
+        x2, y2 = np.ceil(pts.max(axis=0)).astype(int)
+
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            print("[Camera] ROI is empty after clipping; using full frame")
+            self._rect = (0, 0, frame_w, frame_h)
+            self._mask = None
+            return
+
+        self._rect = (int(x1), int(y1), int(x2), int(y2))
+
+        # axis-aligned rectangle → crop is enough
+        is_rect = len(pts) == 4 and set(np.round(pts[:, 0]).tolist()) <= {x1, x2} and set(np.round(pts[:, 1]).tolist()) <= {y1, y2}
+        if is_rect:
+            self._mask = None
+            return
+
+        mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+        local = np.round(pts - [x1, y1]).astype(np.int32)
+        cv2.fillPoly(mask, [local], 255)
+
+        self._mask = mask
+        # pixels outside the mask are never written, so they stay black
+        self._buffer = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+
+    # -----------------------------
+    # PUBLIC
+    # -----------------------------
+    def bounds(self, frame_w: int, frame_h: int) -> Tuple[int, int, int, int]:
+        if not self.enabled:
+            return 0, 0, frame_w, frame_h
+
+        if self._size != (frame_w, frame_h):
+            self._build(frame_w, frame_h)
+
+        return self._rect
+
+    def apply(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Returns (region, (x_offset, y_offset)).
+        Region coordinates + offset = full-frame coordinates.
+        """
+        if not self.enabled:
+            return frame, (0, 0)
+
+        frame_h, frame_w = frame.shape[:2]
+        x1, y1, x2, y2 = self.bounds(frame_w, frame_h)
+        region = frame[y1:y2, x1:x2]
+
+        if self._mask is None:
+            return region, (x1, y1)
+
+        cv2.copyTo(region, self._mask, self._buffer)
+        return self._buffer, (x1, y1)
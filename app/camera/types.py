@@ -14,6 +14,11 @@ class CameraConfig:
     rtsp_url: str
     ai_fps: int
     roi: Dict[str, Any]
+    motion_gate: bool = False
+    # Run person detection every Nth processed frame; tracker predictions in between
+    detect_every: int = 1
+    # Low-res substream for detection; rtsp_url (main stream) is then only decoded for face crops
+    sub_rtsp_url: str | None = None
 
 @dataclass
 class FrameMessage:
@@ -4,20 +4,28 @@ import time
 import cv2
 from typing import List
 import random
-from enum import Enum
 import numpy as np
 from app.camera.helper import is_stable_embedding_global, fast_filter, is_stable_embedding, expand_bbox, select_best_face, crop_with_margin, get_pose_name, now_ms
 from app.camera.types import CameraConfig, TrackState
 from app.config import FRAME_RATE
 
-from ultralytics import YOLO
-from queue import Queue, Empty
-
 from app.ai.insight_detector import InsightFaceEngine
+from app.ai.batch_processor import BATCH_SIZE
+from app.ai.person_detector import create_person_detector
+from app.ai.person_detection_service import PersonDetectionService
+from app.ai.recognition_broker import RecognitionBroker
+from app.ai.tracker_service import ByteTrackerService
 from app.ai.face_mesh_engine import FaceLandmarkerEngine
-from app.camera.extract_person_roi import extract_person_roi
+from app.camera.extract_person_roi import extract_person_roi, extract_head_roi, head_fraction
+from app.camera.face_strategy import choose_face_strategy, assign_faces_to_tracks
+from app.camera.lost_track_cache import LostTrack, LostTrackCache
+from app.camera.motion_gate import MotionGate
+from app.camera.roi_mask import CameraRoi
+from app.capture import ThreadCapture, ProcessCapture, OnDemandCapture
 from app.config.config import envConfig
 from app.events.publisher import EventPublisher
+from app.metrics.latency import FrameLatency
+from app.metrics.runtime_metrics import metrics
 from app.recognition import embedding_store, unknown_embedding_store
 from app.tracking.track_manager import TrackEventEmitter
 from app.database import redis_client
@@ -30,11 +38,28 @@ from app.camera.payload_builder import build_unknown_payload
 MIN_UNKNOWN_CREATION_QUALITY = float(envConfig.MIN_UNKNOWN_CREATION_QUALITY)
 MIN_UNKNOWN_CREATE_FRAMES = int(envConfig.MIN_UNKNOWN_CREATE_FRAMES)
 
-RTSP_TRANSPORT = os.getenv("RTSP_TRANSPORT", "tcp").strip().lower()
-RTSP_TIMEOUT_US = int(os.getenv("RTSP_TIMEOUT_US", "5000000"))
-RTSP_BUFFER_SIZE = int(os.getenv("RTSP_BUFFER_SIZE", "1024000"))
-CAPTURE_BACKOFF_INITIAL = float(os.getenv("CAPTURE_BACKOFF_INITIAL", "1.0"))
-CAPTURE_BACKOFF_MAX = float(os.getenv("CAPTURE_BACKOFF_MAX", "30.0"))
+# "thread": capture runs as a thread of this process
+# "process": one capture process per camera, frames shared through a SharedFrameRing
+CAPTURE_MODE = os.getenv("CAPTURE_MODE", "thread").strip().lower()
+# Cameras with a sub_rtsp_url detect on the substream and pull main-stream frames only for faces
+DUAL_STREAM = os.getenv("DUAL_STREAM", "true").lower() in ("1", "true", "yes")
+DUAL_STREAM_FRAME_TIMEOUT = float(os.getenv("DUAL_STREAM_FRAME_TIMEOUT", "0.5"))
+# grab() every packet, retrieve() only at CameraConfig.ai_fps
+CAPTURE_DECIMATION = os.getenv("CAPTURE_DECIMATION", "true").lower() in ("1", "true", "yes")
+# Batch frames from all cameras into one YOLO call (otherwise calls are serialized one by one)
+PERSON_DETECTION_BATCHING = os.getenv("PERSON_DETECTION_BATCHING", "true").lower() in ("1", "true", "yes")
+# "head": face detection on the head slice of the person box (full box if no face found); "full": whole box
+FACE_ROI_MODE = os.getenv("FACE_ROI_MODE", "head").strip().lower()
+# Tile the ROIs of all tracks needing a face onto shared detector canvases (one pass instead of one per person)
+FACE_ROI_PACKING = os.getenv("FACE_ROI_PACKING", "true").lower() in ("1", "true", "yes")
+# how often the shared runtime metrics (face strategy counts) are printed
+FACE_STRATEGY_LOG_SEC = float(os.getenv("FACE_STRATEGY_LOG_SEC", "30.0"))
+# With CameraConfig.detect_every > 1: re-detect early when a tracked person's score drops below this
+# (default: just above the tracker's activation threshold, so only tracks about to drop out force it)
+PERSON_REDETECT_MARGIN = float(os.getenv("PERSON_REDETECT_MARGIN", "0.05"))
+PERSON_REDETECT_CONF = float(os.getenv("PERSON_REDETECT_CONF")) if os.getenv("PERSON_REDETECT_CONF") else None
+# Batch aligned face crops from all cameras into one embedding-model call (RecognitionBroker)
+RECOGNITION_BATCHING = os.getenv("RECOGNITION_BATCHING", "true").lower() in ("1", "true", "yes")
 
 PROFILE_WEBCAM = dict(
     yaw_threshold=20,
@@ -70,47 +95,46 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 path = os.path.join(BASE_DIR,"../../models/facemesh/face_landmarker.task")
 path = os.path.abspath(path)
 
-model = YOLO("yolov8n.pt")   
+person_detector = create_person_detector()
 insight_engine = InsightFaceEngine()
 publisher = EventPublisher(redis_client)
 face_landmarker_engine = FaceLandmarkerEngine(model_path=path)  
-
-class CameraState(str, Enum):
-    CONNECTING = "CONNECTING"
-    CONNECTED = "CONNECTED"
-    RECONNECTING = "RECONNECTING"
-    DOWN = "DOWN"
+person_detection_service = None   # set by start_camera_threads
 
 def log(cam, person_id, stage, msg):
     print(f"[{now_ms()}][Camera {cam.code}][Person {person_id}][{stage}] {msg}")
 
 
-def _open_capture(rtsp_url: str):
-    if isinstance(rtsp_url, str) and rtsp_url.lower() == "webcam":
-        print("[Camera] Using webcam source")
-        cap = cv2.VideoCapture(0)
-        print("Camera FPS:", "webcam", cap.get(cv2.CAP_PROP_FPS))
-        return cap
+def _create_capture(cam: CameraConfig):
+    ai_fps = cam.ai_fps if CAPTURE_DECIMATION else 0
+    source_url = cam.sub_rtsp_url if DUAL_STREAM and cam.sub_rtsp_url else cam.rtsp_url
 
-    ffmpeg_options = [f"rtsp_transport;{RTSP_TRANSPORT}", f"stimeout;{RTSP_TIMEOUT_US}", f"buffer_size;{RTSP_BUFFER_SIZE}"]
-    os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "|".join(ffmpeg_options)
+    if CAPTURE_MODE == "process":
+        return ProcessCapture(cam.code, source_url, ai_fps=ai_fps)
 
-    cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
-    try:
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-    except Exception:
-        pass
-    print("Camera FPS:", rtsp_url, cap.get(cv2.CAP_PROP_FPS))
-    return cap
+    return ThreadCapture(cam.code, source_url, ai_fps=ai_fps)
 
 def start_camera_threads(cameras: List[CameraConfig]) -> None:  
     """
-    Spawn one capture thread per camera.
+    Spawn one worker thread per camera.
+    With CAPTURE_MODE=process each worker also owns a capture process.
     """
+    global person_detection_service
 
     print(f"[Camera] Starting {len(cameras)} camera threads...")
 
+    # one frame per camera at most → dispatch as soon as every camera has submitted
+    max_batch = min(BATCH_SIZE, len(cameras)) if PERSON_DETECTION_BATCHING else 1
+    person_detection_service = PersonDetectionService(person_detector, max_batch=max_batch)
+
+    # embed_faces() from every worker goes through one batching dispatcher
+    if RECOGNITION_BATCHING and not isinstance(insight_engine.embedder, RecognitionBroker):
+        insight_engine.embedder = RecognitionBroker(insight_engine.embedder)
+
     for cam in cameras:
+        if isinstance(insight_engine.embedder, RecognitionBroker):
+            insight_engine.embedder.register()
+
         thread = threading.Thread(
             target=_camera_loop,
             args=(cam,),
@@ -132,7 +156,6 @@ def _camera_loop(cam: CameraConfig) -> None:
 
     # target_fps = int(FRAME_RATE)
     # interval = 1.0 / target_fps
-    backoff = CAPTURE_BACKOFF_INITIAL
 
     track_event_emitter = TrackEventEmitter(publisher=publisher, gate_type=cam.gate_type)
     builder = UniqueFaceRepresentationBuilder()
@@ -144,50 +167,268 @@ def _camera_loop(cam: CameraConfig) -> None:
     track_unknown_identity = {}
     track_unknown_meta = {}
     track_embedding_state = {}
+    track_motion = {}      # tid -> (bbox, frame_ts, velocity px/sec)
+    visible_ids = set()
+    lost_tracks = LostTrackCache()
+
+    def _forget_track(tid):
+        track_state.pop(tid, None)
+        track_identity.pop(tid, None)
+        track_known_buffer.pop(tid, None)
+        track_unknown_buffer.pop(tid, None)
+        track_unknown_identity.pop(tid, None)
+        track_unknown_meta.pop(tid, None)
+        track_embedding_state.pop(tid, None)
+        track_motion.pop(tid, None)
+
+    def _note_visible(current_ids):
+        """
+        Tracks with a resolved identity that just vanished go to the lost-track cache;
+        a track that comes back under its own ID leaves it again.
+        """
+        for tid in visible_ids - current_ids:
+            state = track_state.get(tid)
+            motion = track_motion.get(tid)
+            ref = track_embedding_state.get(tid, {}).get("ref")
+            if state not in (TrackState.MATCHED_KNOWN, TrackState.UPDATING_UNKNOWN) or motion is None or ref is None:
+                continue
 
-    # For RTSP Thread
-    frame_queue = Queue(maxsize=1)
-    stop_event = threading.Event()
-    frame_count = 0
+            identity = track_identity.get(tid) if state == TrackState.MATCHED_KNOWN else track_unknown_identity.get(tid)
+            if identity is None:
+                continue
+
+            bbox, seen_at, velocity = motion
+            lost_tracks.add(LostTrack(
+                track_id=tid,
+                bbox=bbox,
+                velocity=velocity,
+                lost_at=seen_at,
+                state=state,
+                identity=identity,
+                ref_embedding=ref,
+                unknown_meta=track_unknown_meta.get(tid),
+            ))
+
+        for tid in current_ids:
+            lost_tracks.discard(tid)
+
+        visible_ids.clear()
+        visible_ids.update(current_ids)
+
+    def _inherit_identity(person_id, lost, embedding, latency):
+        track_state[person_id] = lost.state
+        track_known_buffer.pop(person_id, None)
+        track_embedding_state[person_id] = {"ref": lost.ref_embedding, "last": embedding}
+
+        # the new track ID never goes through recognition → confirm it here (deduplicated per track)
+        if lost.state == TrackState.MATCHED_KNOWN:
+            track_identity[person_id] = lost.identity
+            similarity = float(np.dot(embedding, lost.ref_embedding))
+            track_event_emitter.recognition_confirmed(cam.code, person_id, lost.identity, similarity, latency=latency)
+        else:
+            track_unknown_identity[person_id] = lost.identity
+            track_unknown_meta[person_id] = lost.unknown_meta or {"pose_best": {}, "last_update": 0}
+            track_event_emitter.unknown_confirmed(cam.code, person_id, lost.identity, latency=latency)
+
+        log(cam, person_id, "RELINK", f"← track {lost.track_id} ({lost.state.value} {lost.identity})")
+
+    def _detect_faces_for_tracks(tracks, face_source):
+        """
+        Face detection (no embeddings yet) for every track in `tracks` [(person_id, bbox)].
+        Head slices first, then the whole box for tracks that got no face.
+        Returns {person_id: faces} for tracks with at least one face.
+        """
+        _, face_det_frame, face_shift, face_scale = face_source
+        face_det_h, face_det_w = face_det_frame.shape[:2]
+
+        person_boxes = {
+            person_id: np.array(expand_bbox(bbox * face_scale - face_shift, face_det_w, face_det_h))
+            for person_id, bbox in tracks
+        }
+
+        passes = [extract_head_roi, extract_person_roi] if FACE_ROI_MODE == "head" else [extract_person_roi]
+
+        # Many (overlapping) people → one detection over the region holding all of them can be cheaper.
+        def _rects(extract_roi):
+            rects = {}
+            for person_id, person_box in person_boxes.items():
+                roi_data = extract_roi(face_det_frame, person_id, person_box)
+                if roi_data is not None:
+                    _, roi, (x, y) = roi_data
+                    rects[person_id] = (x, y, x + roi.shape[1], y + roi.shape[0])
+            return rects
+
+        person_rects = _rects(extract_person_roi)
+        first_rects = person_rects if passes[0] is extract_person_roi else _rects(passes[0])
+
+        strategy = choose_face_strategy(
+            list(first_rects.values()),
+            list(person_rects.values()),
+            lambda shapes: insight_engine.detection_cost(shapes, packed=FACE_ROI_PACKING),
+        )
+        metrics.inc(f"face_strategy_{strategy.name}")
+        metrics.log(FACE_STRATEGY_LOG_SEC)
+
+        if strategy.name == "region":
+            x1, y1, x2, y2 = strategy.region
+            shift_x, shift_y = int(face_shift[0]), int(face_shift[1])
+
+            faces = insight_engine.detect_faces(
+                face_det_frame[y1:y2, x1:x2], (x1 + shift_x, y1 + shift_y), cam.code, det_size=strategy.det_size
+            )
+
+            # faces come back in frame coordinates (detection shift added); match the person boxes to that
+            shifted = {
+                person_id: np.array(rect, dtype=np.float32) + (shift_x, shift_y, shift_x, shift_y)
+                for person_id, rect in person_rects.items()
+            }
+            return assign_faces_to_tracks(faces, shifted)
 
+        faces_by_track = {}
 
+        for extract_roi in passes:
+            rois, offsets, owners = [], [], []
 
-    def _reader(cap):
-        while not stop_event.is_set():
-            ret, frame = cap.read()
+            for person_id, person_box in person_boxes.items():
+                if person_id in faces_by_track:
+                    continue
+                # box is already (almost) all head → the full-box pass covers it
+                if extract_roi is extract_head_roi and head_fraction(person_box) >= 1.0:
+                    continue
 
-            if not ret or frame is None:
+                roi_data = extract_roi(face_det_frame, person_id, person_box)
+                if roi_data is None:
+                    continue
+
+                _, roi, (offset_x, offset_y) = roi_data
+                rois.append(roi)
+                offsets.append((offset_x + int(face_shift[0]), offset_y + int(face_shift[1])))
+                owners.append(person_id)
+
+            if not rois:
                 continue
 
-            if frame_queue.full():
-                try:
-                    frame_queue.get_nowait()  # drop old frame
-                except:
-                    pass
+            if FACE_ROI_PACKING and len(rois) > 1:
+                results = insight_engine.detect_faces_batch(rois, offsets, cam.code)
+            else:
+                results = [insight_engine.detect_faces(roi, offset, cam.code) for roi, offset in zip(rois, offsets)]
 
-            frame_queue.put(frame)
+            for person_id, faces in zip(owners, results):
+                if faces:
+                    faces_by_track[person_id] = faces
 
+        return faces_by_track
 
-    while True:
-        cap = _open_capture(cam.rtsp_url)
+    def _embed_faces_for_tracks(faces_by_track):
+        """
+        Fast filter per track (single-face tracks only; the track loop skips the rest),
+        then one embed_faces call for the survivors of every track.
+        Returns {person_id: embedded faces}.
+        """
+        filtered_by_track = {}
 
-        if not cap.isOpened():
-            sleep_time = min(backoff, CAPTURE_BACKOFF_MAX)
-            print(f"[Camera] ❌ Connect failed → {cam.code}; retry in {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-            backoff = min(backoff * 2, CAPTURE_BACKOFF_MAX)
-            continue
+        for person_id, faces in faces_by_track.items():
+            if len(faces) > 1:
+                continue
 
-        stop_event.clear()
+            required_min_width = envConfig.MIN_RECOGNITION_FACE_WIDTH
+            if track_state.get(person_id) in (TrackState.COLLECTING_UNKNOWN, TrackState.UPDATING_UNKNOWN):
+                required_min_width = envConfig.MIN_UNKNOWN_REG_FACE_WIDTH
 
-        reader_thread = threading.Thread(
-            target=_reader,
-            args=(cap,),
-            daemon=True
+            filtered_faces = []
+            for f in faces:
+                filter_result = fast_filter(f, min_width=required_min_width)
+
+                if isinstance(filter_result, dict) and not filter_result.get("status", False):
+                    reason = filter_result.get("reason", "unknown")
+                    details = filter_result.get("details", "")
+                    print(
+                        f"[{now_ms()}][Camera {cam.code}][Person {person_id}][FAST_FILTER] "
+                        f"reason={reason} details={details}"
+                    )
+                    continue
+
+                filtered_faces.append(f)
+
+            if filtered_faces:
+                filtered_by_track[person_id] = filtered_faces
+
+        # only faces that survived the filters pay for the recognition model, in one batch per frame
+        embedded = {id(f) for f in insight_engine.embed_faces([f for faces in filtered_by_track.values() for f in faces])}
+
+        return {
+            person_id: [f for f in faces if id(f) in embedded]
+            for person_id, faces in filtered_by_track.items()
+        }
+
+    capture = _create_capture(cam)
+    main_capture = OnDemandCapture(cam.code, cam.rtsp_url) if DUAL_STREAM and cam.sub_rtsp_url else None
+    motion_gate = MotionGate() if cam.motion_gate else None
+    camera_roi = CameraRoi(cam.roi)
+    if camera_roi.enabled:
+        print(f"[Camera] ROI enabled → {cam.code}")
+
+    # Track IDs are per camera: detection is shared, tracker state is not.
+    # The tracker only sees detector frames, so its clock runs at fps / detect_every.
+    detect_every = max(1, cam.detect_every)
+    tracker = ByteTrackerService(frame_rate=max(1, round((cam.ai_fps or int(FRAME_RATE)) / detect_every)))
+    frames_since_detect = detect_every
+    redetect_conf = PERSON_REDETECT_CONF if PERSON_REDETECT_CONF is not None else tracker.track_activation_threshold + PERSON_REDETECT_MARGIN
+
+    def _detect_people(det_frame):
+        """
+        Person tracks in det_frame coordinates: (ids, boxes) or (None, None) if nobody is tracked.
+        Runs the detector every `detect_every` frames (or sooner when a track's score is low);
+        other frames use the tracker's predicted boxes.
+        """
+        nonlocal frames_since_detect
+
+        min_score = tracker.min_score()
+        if frames_since_detect < detect_every and min_score is not None and min_score >= redetect_conf:
+            frames_since_detect += 1
+            tracked = tracker.predict()
+            latency.mark("predict")
+        else:
+            frames_since_detect = 1
+            try:
+                det_boxes, det_scores = person_detection_service.detect(det_frame)
+                tracked = tracker.update(det_boxes, det_scores)
+            except Exception as e:
+                # timed out / failed batch: coast on the tracker instead of killing the camera thread
+                print(f"[Camera] ⚠️ Person detection failed → {cam.code}: {e!r}")
+                tracked = tracker.predict()
+            latency.mark("detect")
+
+        if not tracked:
+            return None, None
+        return (
+            np.array([tid for tid, _ in tracked], dtype=np.int64),
+            np.array([bbox for _, bbox in tracked], dtype=np.float32),
         )
-        reader_thread.start()
 
-        backoff = CAPTURE_BACKOFF_INITIAL
+    def _face_source(frame, det_frame, roi_shift):
+        """
+        Where face ROIs and crops come from for the current frame:
+        (face_frame, face_det_frame, shift, scale)
+        face bbox = detection bbox * scale - shift, in face_det_frame coordinates.
+        """
+        if main_capture is None:
+            return frame, det_frame, roi_shift, np.ones(4, dtype=np.float32)
+
+        main = main_capture.request(timeout=DUAL_STREAM_FRAME_TIMEOUT)
+        if main is None:
+            return None, None, None, None
+        held_frames.append((main_capture, main))
+
+        frame_h, frame_w = frame.shape[:2]
+        main_h, main_w = main.shape[:2]
+        scale = np.array([main_w / frame_w, main_h / frame_h] * 2, dtype=np.float32)
+        return main, main, np.zeros(4, dtype=np.float32), scale
+    frame_count = 0
+    held_frames = []   # (capture, frame) pairs to release once the iteration is over
+
+    while True:
+        capture.open()
 
         # last_processed = 0.0
 
@@ -207,20 +448,27 @@ def _camera_loop(cam: CameraConfig) -> None:
 
             # last_processed = now
 
-            try:
-                frame = frame_queue.get(timeout=5)
-                if frame is None or frame.size == 0:
-                    continue
-            except Empty:
-                print(f"[Camera] ⚠️ No frames → {cam.code}; reconnecting")
-                # cap.release()
-                # stop_event.set()
-                # break
-                stop_event.set()
-
-                reader_thread.join(timeout=2)   # wait for thread to exit safely
-
-                cap.release()
+            # previous iteration is done with its frames → back to the capture pools
+            for owner, used in held_frames:
+                owner.release(used)
+            held_frames.clear()
+
+            item = capture.read(timeout=5)
+            if item is None and getattr(capture, "finished", False):
+                # non-looping replay reached its end → nothing will come back
+                print(f"[Camera] Replay finished → {cam.code}; stopping worker")
+                capture.stop()
+                if main_capture is not None:
+                    main_capture.stop()
+                if isinstance(insight_engine.embedder, RecognitionBroker):
+                    insight_engine.embedder.unregister()
+                return
+
+            if item is None:
+                # The capture supervisor reconnects on its own; drop per-track state meanwhile.
+                state = getattr(capture, "state", None)
+                print(f"[Camera] ⚠️ No frames → {cam.code} ({getattr(state, 'value', 'process')}); resetting tracks")
+                capture.close()
 
                 track_state.clear()
                 track_identity.clear()
@@ -229,29 +477,51 @@ def _camera_loop(cam: CameraConfig) -> None:
                 track_unknown_identity.clear()
                 track_unknown_meta.clear()
                 track_embedding_state.clear()
+                track_motion.clear()
+                visible_ids.clear()
+                lost_tracks.clear()
+                tracker.reset()
 
                 break
 
+            frame, frame_ts, captured_at = item
+            held_frames.append((capture, frame))
+            latency = FrameLatency(captured_at)
+            latency.mark("capture")   # grab → worker (decode, queue/ring wait)
+            if frame.size == 0:
+                continue
+
             frame_h, frame_w = frame.shape[:2]
 
-            results = model.track(frame, persist=True, classes=[0], conf=0.25, verbose=False)
+            # Idle scene and nobody tracked → skip YOLO + face pipeline (heartbeat still runs).
+            if motion_gate is not None and not motion_gate.should_run(frame, active_tracks=bool(track_event_emitter.tracks)):
+                continue
+
+            # Detection only sees the configured ROI (cropped + masked); boxes are mapped back below.
+            det_frame, (roi_x, roi_y) = camera_roi.apply(frame)
+            roi_shift = np.array([roi_x, roi_y, roi_x, roi_y], dtype=np.float32)
+
+            ids, boxes = _detect_people(det_frame)
 
-            if results[0].boxes.id is None:
+            _note_visible(set(ids.tolist()) if ids is not None else set())
+
+            if ids is None:
+                # Nobody in view: still expire lost tracks so per-track state drains.
+                for tid in track_event_emitter.cleanup_lost_tracks(cam.code, []):
+                    _forget_track(tid)
                 continue
 
-            boxes = results[0].boxes.xyxy.cpu().numpy()
-            ids = results[0].boxes.id.int().cpu().numpy()
+            boxes = boxes + roi_shift
 
             lost = track_event_emitter.cleanup_lost_tracks(cam.code, ids.tolist())
 
             for tid in lost:
-                track_state.pop(tid, None)
-                track_identity.pop(tid, None)
-                track_known_buffer.pop(tid, None)
-                track_unknown_buffer.pop(tid, None)
-                track_unknown_identity.pop(tid, None)
-                track_unknown_meta.pop(tid, None)
-                track_embedding_state.pop(tid, None)
+                _forget_track(tid)
+
+            face_source = None      # resolved on the first track that needs a face
+            faces_by_track = None   # one (packed) face pass for all of them
+            embedded_by_track = None   # one embedder batch for all of them
+            face_tracks = [(int(pid), bbox) for pid, bbox in zip(ids, boxes) if int(pid) not in track_identity]
 
             for person_id, bbox in zip(ids, boxes):
 
@@ -262,11 +532,17 @@ def _camera_loop(cam: CameraConfig) -> None:
                     cam.code,
                     person_id,
                     bbox,
-                    int(time.time() * 1000),
+                    int(frame_ts * 1000),
                     frame_w,
                     frame_h
                 )
 
+                previous = track_motion.get(person_id)
+                velocity = np.zeros(4, dtype=np.float32)
+                if previous is not None and frame_ts > previous[1]:
+                    velocity = (bbox - previous[0]) / (frame_ts - previous[1])
+                track_motion[person_id] = (bbox, frame_ts, velocity)
+
                 if person_id in track_identity:
                     continue
 
@@ -282,15 +558,21 @@ def _camera_loop(cam: CameraConfig) -> None:
                 # -------------------------
                 # ROI + FACE DETECTION
                 # -------------------------
-                x1, y1, x2, y2 = expand_bbox(bbox, frame_w, frame_h)
-                roi_data = extract_person_roi(frame, person_id, np.array([x1, y1, x2, y2]))
-                if roi_data is None:
-                    continue
+                if face_source is None:
+                    face_source = _face_source(frame, det_frame, roi_shift)
+                    latency.mark("main_stream")
 
-                _, roi, offset = roi_data
+                face_frame, face_det_frame, face_shift, face_scale = face_source
+                if face_frame is None:
+                    continue   # main stream not ready yet
 
-                faces = insight_engine.detect_and_generate_embedding(roi, offset, cam.code)
+                if faces_by_track is None:
+                    faces_by_track = _detect_faces_for_tracks(face_tracks, face_source)
+                    latency.mark("face")
+                    embedded_by_track = _embed_faces_for_tracks(faces_by_track)
+                    latency.mark("embed")
 
+                faces = faces_by_track.get(person_id)
                 if not faces:
                     continue
 
@@ -298,27 +580,8 @@ def _camera_loop(cam: CameraConfig) -> None:
                     print(f"[Camera {cam.code}] Skipping ROI with multiple faces: {len(faces)}")
                     continue
 
-                # Filter bad faces after detection and log rejection reason.
-                filtered_faces = []
-                required_min_width = envConfig.MIN_RECOGNITION_FACE_WIDTH
-                if state in (TrackState.COLLECTING_UNKNOWN, TrackState.UPDATING_UNKNOWN):
-                    required_min_width = envConfig.MIN_UNKNOWN_REG_FACE_WIDTH
-
-                for f in faces:
-                    filter_result = fast_filter(f, min_width=required_min_width)
-
-                    if isinstance(filter_result, dict) and not filter_result.get("status", False):
-                        reason = filter_result.get("reason", "unknown")
-                        details = filter_result.get("details", "")
-                        print(
-                            f"[{now_ms()}][Camera {cam.code}][Person {person_id}][FAST_FILTER] "
-                            f"reason={reason} details={details}"
-                        )
-                        continue
-
-                    filtered_faces.append(f)
-
-                faces = filtered_faces
+                # fast-filtered and embedded with every other track's faces (bad faces logged there)
+                faces = embedded_by_track.get(person_id)
                 if not faces:
                     continue
 
@@ -341,7 +604,7 @@ def _camera_loop(cam: CameraConfig) -> None:
                         continue
 
 
-                    face_img = crop_with_margin(frame, x1, y1, x2, y2, margin=0.2)
+                    face_img = crop_with_margin(face_frame, x1, y1, x2, y2, margin=0.2)
 
                     if face_img.size == 0:
                         continue
@@ -372,6 +635,7 @@ def _camera_loop(cam: CameraConfig) -> None:
                     f["quality"] = final_quality
                     valid_faces.append(f)
 
+                latency.mark("quality")
                 if not valid_faces:
                     continue
 
@@ -391,6 +655,13 @@ def _camera_loop(cam: CameraConfig) -> None:
 
                 pose = get_pose_name(best_face.get("pose", [None])[0]) or "unknown"
 
+                # New ID for someone we just lost (occlusion / ID switch) → take over their identity.
+                if state == TrackState.COLLECTING_KNOWN and not lost_tracks.empty():
+                    relinked = lost_tracks.match(bbox, embedding, frame_ts)
+                    if relinked is not None:
+                        _inherit_identity(person_id, relinked, embedding, latency)
+                        continue
+
                 # =====================================================
                 # 🔵 STAGE 1: KNOWN
                 # =====================================================
@@ -426,6 +697,7 @@ def _camera_loop(cam: CameraConfig) -> None:
 
                     log(cam, person_id, "KNOWN", "RUN MATCH")
                     match = embedding_store.find_match(final)
+                    latency.mark("match")
 
                     log(cam, person_id, "KNOWN", f"MATCH RESULT → {match['employee_id'] if match else 'NO MATCH'}")
 
@@ -437,7 +709,8 @@ def _camera_loop(cam: CameraConfig) -> None:
                             cam.code,
                             person_id,
                             match["employee_id"],
-                            match["similarity"]
+                            match["similarity"],
+                            latency=latency
                         )
 
                         log(cam, person_id, "KNOWN", f"MATCHED → {match['employee_id']}")
@@ -491,6 +764,7 @@ def _camera_loop(cam: CameraConfig) -> None:
                         continue
 
                     match = unknown_embedding_store.find_match(centroid)
+                    latency.mark("match")
 
                     if match:
                         unknown_id = match["unknown_id"]
@@ -520,7 +794,7 @@ def _camera_loop(cam: CameraConfig) -> None:
                     track_unknown_meta[person_id] = {"pose_best": {}, "last_update": 0}
 
                     # log(cam, person_id, "STATE", "→ UPDATING_UNKNOWN")
-                    track_event_emitter.unknown_confirmed(cam.code, person_id, unknown_id)
+                    track_event_emitter.unknown_confirmed(cam.code, person_id, unknown_id, latency=latency)
                     continue
 
                 # =====================================================
@@ -0,0 +1,11 @@
+from .reader import CaptureReader
+from .source import open_capture
+from .frame_ring import SharedFrameRing
+from .frame_pool import FramePool
+from .fingerprint import frame_fingerprint
+from .supervisor import CameraSupervisor, CameraState
+from .thread_capture import ThreadCapture
+from .process_capture import ProcessCapture
+from .on_demand_capture import OnDemandCapture
+
+__all__ = ["CaptureReader", "open_capture", "SharedFrameRing", "FramePool", "frame_fingerprint", "CameraSupervisor", "CameraState", "ThreadCapture", "ProcessCapture", "OnDemandCapture"]
@@ -0,0 +1,19 @@
+import os
+import zlib
+
+import numpy as np
+
+# sample every Nth row/column; 8 → ~100 KB hashed for a 1080p frame
+CAPTURE_FINGERPRINT_STEP = int(os.getenv("CAPTURE_FINGERPRINT_STEP", "8"))
+
+
+def frame_fingerprint(frame: np.ndarray, step: int = CAPTURE_FINGERPRINT_STEP) -> int:
+    """
+    Cheap hash of a strided subsample of the frame.
+    Equal fingerprints mean the decoder produced the same picture again: a dead
+    camera behind an NVR re-sending its last frame, but also a static scene in a
+    compressed stream (skipped macroblocks decode bit-identical). Only a long run
+    of repeats is evidence of a frozen source.
+    """
+    sample = np.ascontiguousarray(frame[::step, ::step])
+    return zlib.crc32(sample.data)
@@ -0,0 +1,78 @@
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+# frames in flight per camera: one being decoded, one queued, one in the worker, one spare
+CAPTURE_FRAME_POOL_SIZE = int(os.getenv("CAPTURE_FRAME_POOL_SIZE", "4"))
+
+
+class FramePool:
+    """
+    Small per-camera pool of preallocated BGR frames.
+
+    The reader decodes into a pooled buffer (cap.retrieve(image=buf)) instead of
+    letting OpenCV allocate a new ~6 MB array per frame; the consumer gives the
+    frame back with release() once it is done with it.
+
+    - Buffers are created from the first decoded frame's shape, up to `size`.
+    - When every buffer is in flight, acquire() returns None and OpenCV allocates
+      as before (counted as a miss), so the capture never blocks on the pool.
+    - A resolution change drops the old buffers; releasing one of them is a no-op.
+    """
+
+    def __init__(self, size: int = CAPTURE_FRAME_POOL_SIZE):
+        self.size = size
+
+        self._lock = threading.Lock()
+        self._free = []
+        self._owned = {}     # id(buffer) -> buffer, for every pooled buffer (free or in flight)
+        self._shape = None
+
+        self.misses = 0
+
+    def acquire(self) -> Optional[np.ndarray]:
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+
+            if self._shape is not None and len(self._owned) < self.size:
+                buf = np.empty(self._shape, dtype=np.uint8)
+                self._owned[id(buf)] = buf
+                return buf
+
+            if self._shape is not None:
+                self.misses += 1
+            return None
+
+    def adopt(self, buf: Optional[np.ndarray], frame: np.ndarray) -> None:
+        """
+        Call after retrieve(): takes ownership of `frame` when OpenCV did not
+        decode into `buf` (first frame, resolution change, source without image=).
+        """
+        if frame is buf:
+            return
+
+        with self._lock:
+            if buf is not None:
+                self._owned.pop(id(buf), None)
+
+            if frame.shape != self._shape:
+                self._shape = frame.shape
+                self._free.clear()
+                self._owned.clear()
+
+            if len(self._owned) < self.size:
+                self._owned[id(frame)] = frame
+
+    def release(self, frame: Optional[np.ndarray]) -> None:
+        if frame is None:
+            return
+
+        with self._lock:
+            if self._owned.get(id(frame)) is not frame:
+                return
+            if any(f is frame for f in self._free):
+                return
+            self._free.append(frame)
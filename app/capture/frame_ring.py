@@ -0,0 +1,160 @@
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+CAPTURE_RING_SLOTS = int(os.getenv("CAPTURE_RING_SLOTS", "4"))
+CAPTURE_RING_MAX_WIDTH = int(os.getenv("CAPTURE_RING_MAX_WIDTH", "1920"))
+CAPTURE_RING_MAX_HEIGHT = int(os.getenv("CAPTURE_RING_MAX_HEIGHT", "1080"))
+
+# header row 0 (control): latest_seq, latest_slot, pinned_slot, unused, unused
+# header row 1..N (slots): seq, height, width, timestamp_ns, captured_at_ns (monotonic)
+_HEADER_COLS = 5
+_ALIGN = 64
+
+
+class SharedFrameRing:
+    """
+    Fixed-slot frame ring in multiprocessing.shared_memory.
+
+    Single writer (capture process), single reader (camera worker).
+
+    - Every slot is a max-size BGR buffer; the real frame shape is stored per slot.
+    - A slot's seq is set to -1 while it is being written, then to the frame seq.
+    - The reader pins the slot it is working on; the writer never overwrites a
+      pinned slot, so frames handed out by read_latest() are zero-copy views
+      that stay valid until the next read_latest() call.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        slots: int = CAPTURE_RING_SLOTS,
+        max_height: int = CAPTURE_RING_MAX_HEIGHT,
+        max_width: int = CAPTURE_RING_MAX_WIDTH,
+        create: bool = True,
+    ):
+        if slots < 3:
+            raise ValueError("SharedFrameRing needs at least 3 slots")
+
+        self.slots = slots
+        self.max_height = max_height
+        self.max_width = max_width
+        self.slot_bytes = max_height * max_width * 3
+
+        header_bytes = (slots + 1) * _HEADER_COLS * 8
+        self._data_offset = (header_bytes + _ALIGN - 1) // _ALIGN * _ALIGN
+        total = self._data_offset + slots * self.slot_bytes
+
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=total)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.name = self.shm.name
+        self._header = np.ndarray((slots + 1, _HEADER_COLS), dtype=np.int64, buffer=self.shm.buf)
+        self._data = np.ndarray(
+            (slots, self.slot_bytes), dtype=np.uint8, buffer=self.shm.buf, offset=self._data_offset
+        )
+
+        if create:
+            self._header[:] = 0
+            self._header[0, 1] = -1
+            self._header[0, 2] = -1
+
+    # -----------------------------
+    # WRITER
+    # -----------------------------
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None, captured_at: Optional[float] = None) -> int:
+        control = self._header[0]
+
+        slot = (int(control[1]) + 1) % self.slots
+        if slot == int(control[2]):
+            slot = (slot + 1) % self.slots
+
+        seq = int(control[0]) + 1
+        row = self._header[1 + slot]
+        row[0] = -1
+
+        h, w = frame.shape[:2]
+        if h > self.max_height or w > self.max_width:
+            scale = min(self.max_height / h, self.max_width / w)
+            h, w = int(h * scale), int(w * scale)
+            cv2.resize(frame, (w, h), dst=self._slot_view(slot, h, w))
+        else:
+            self._slot_view(slot, h, w)[:] = frame
+
+        ts = time.time() if timestamp is None else timestamp
+        mono = time.monotonic() if captured_at is None else captured_at
+        row[1] = h
+        row[2] = w
+        row[3] = int(ts * 1e9)
+        row[4] = int(mono * 1e9)
+        row[0] = seq
+
+        control[1] = slot
+        control[0] = seq
+        return seq
+
+    # -----------------------------
+    # READER
+    # -----------------------------
+    def read_latest(self, after_seq: int = 0) -> Optional[Tuple[int, np.ndarray, float, float]]:
+        """
+        Returns (seq, frame_view, timestamp, captured_at) for the newest frame with seq > after_seq.
+        """
+        control = self._header[0]
+
+        seq = int(control[0])
+        if seq <= after_seq:
+            return None
+
+        slot = int(control[1])
+        control[2] = slot
+
+        row = self._header[1 + slot]
+        if int(row[0]) != seq:
+            # writer moved on between the two reads; caller retries
+            return None
+
+        h, w = int(row[1]), int(row[2])
+        return seq, self._slot_view(slot, h, w), row[3] / 1e9, row[4] / 1e9
+
+    def wait_latest(self, after_seq: int, timeout: float, poll: float = 0.002):
+        deadline = time.monotonic() + timeout
+
+        while True:
+            item = self.read_latest(after_seq)
+            if item is not None:
+                return item
+
+            if time.monotonic() >= deadline:
+                return None
+
+            time.sleep(poll)
+
+    def latest_seq(self) -> int:
+        return int(self._header[0, 0])
+
+    # -----------------------------
+    # INTERNAL
+    # -----------------------------
+    def _slot_view(self, slot: int, h: int, w: int) -> np.ndarray:
+        return self._data[slot, : h * w * 3].reshape(h, w, 3)
+
+    # -----------------------------
+    # LIFECYCLE
+    # -----------------------------
+    def close(self) -> None:
+        self._header = None
+        self._data = None
+        self.shm.close()
+
+    def unlink(self) -> None:
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,67 @@
+import os
+import time
+import threading
+from queue import Empty
+from typing import Optional
+
+import numpy as np
+
+from .supervisor import CameraState
+from .thread_capture import ThreadCapture
+
+DUAL_STREAM_IDLE_SEC = float(os.getenv("DUAL_STREAM_IDLE_SEC", "10.0"))
+
+
+class OnDemandCapture(ThreadCapture):
+    """
+    High-resolution stream that is only decoded to BGR when a frame is requested.
+
+    - Connects on the first request() and stays connected (grab() only) while
+      requests keep coming; disconnects after `idle_timeout` without requests.
+    - request() returns None while the stream is (re)connecting, never blocks on connect.
+    """
+
+    def __init__(self, camera_code: str, source_url: str, idle_timeout: float = DUAL_STREAM_IDLE_SEC):
+        super().__init__(camera_code, source_url, ai_fps=0)
+
+        self.idle_timeout = idle_timeout
+
+        self.demand = threading.Event()
+        self.reader.demand = self.demand
+
+        self._wanted = threading.Event()
+        self._last_request = 0.0
+
+        self._keeper = threading.Thread(target=self._keep_connected, daemon=True)
+        self._keeper.start()
+
+    def _keep_connected(self) -> None:
+        while True:
+            self._wanted.wait()
+
+            print(f"[Camera] Main stream requested → {self.camera_code}")
+            self.open()
+
+            while time.monotonic() - self._last_request <= self.idle_timeout:
+                time.sleep(0.5)
+
+            print(f"[Camera] Main stream idle → {self.camera_code}; disconnecting")
+            self._wanted.clear()
+            self.stop()
+
+    def request(self, timeout: float) -> Optional[np.ndarray]:
+        self._last_request = time.monotonic()
+        self._wanted.set()
+
+        if self.state != CameraState.CONNECTED:
+            return None
+
+        # drop a frame decoded for an earlier request that timed out
+        try:
+            self.pool.release(self.frame_queue.get_nowait()[0])
+        except Empty:
+            pass
+
+        self.demand.set()
+        item = self.read(timeout)
+        return item[0] if item is not None else None
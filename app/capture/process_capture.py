@@ -0,0 +1,160 @@
+import os
+import sys
+import multiprocessing as mp
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .frame_ring import SharedFrameRing
+from .thread_capture import ThreadCapture
+from .supervisor import CAPTURE_RECONNECT_CONCURRENCY
+
+_ctx = mp.get_context("spawn")
+_connect_slots = None
+
+# modules that load models / open Redis at import; a capture child must never have them
+_PARENT_ONLY_MODULES = ("app.camera.worker", "app.api.server")
+
+
+def _shared_connect_slots():
+    """
+    One semaphore shared by all capture processes (bounded reconnect concurrency site-wide).
+    """
+    global _connect_slots
+    if _connect_slots is None:
+        _connect_slots = _ctx.BoundedSemaphore(CAPTURE_RECONNECT_CONCURRENCY)
+    return _connect_slots
+
+
+def _capture_main(camera_code, source_url, ai_fps, ring_name, slots, max_height, max_width, stop_event, connect_slots, finished_event):
+    """
+    Entry point of a capture process: decode one camera and publish frames into its ring.
+    Runs in a spawned interpreter, which re-imports the parent's __main__ module first;
+    that module must keep its top-level imports light (see app.main), checked below.
+    Exits (setting finished_event) once a non-looping replay has delivered its last frame.
+    """
+    heavy = [name for name in _PARENT_ONLY_MODULES if name in sys.modules]
+    if heavy:
+        print(f"[Capture] ⚠️ Capture process for {camera_code} imported {heavy} (pid={os.getpid()}); models and Redis load once per camera — move the entry module's app imports into main()")
+
+    ring = SharedFrameRing(
+        name=ring_name,
+        slots=slots,
+        max_height=max_height,
+        max_width=max_width,
+        create=False
+    )
+
+    capture = ThreadCapture(camera_code, source_url, ai_fps=ai_fps, connect_slots=connect_slots)
+    print(f"[Capture] Process started → {camera_code} (pid={os.getpid()})")
+
+    try:
+        capture.open()
+
+        while not stop_event.is_set():
+            item = capture.read(timeout=1.0)
+            if item is None:
+                if capture.finished:
+                    finished_event.set()
+                    break
+                continue
+
+            frame, timestamp, captured_at = item
+            ring.write(frame, timestamp, captured_at)   # copies into shared memory
+            capture.release(frame)
+    finally:
+        capture.stop()
+        ring.close()
+
+
+class ProcessCapture:
+    """
+    Capture running in its own process (decode + colour conversion off the worker's GIL).
+
+    Frames come back through a SharedFrameRing as zero-copy views; a view stays
+    valid until the next read(). Reconnecting is the capture process's job.
+    The ring always keeps the newest frame, so fast replays are not lossless here.
+    A finished replay ends the process; `finished` is then True and open() does
+    not restart it.
+    """
+
+    def __init__(self, camera_code: str, source_url: str, ai_fps: float = 0):
+        self.camera_code = camera_code
+        self.source_url = source_url
+        self.ai_fps = ai_fps
+
+        self._stop_event = None
+        self._finished_event = None
+        self.process = None
+        self.ring = None
+        self._last_seq = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._finished_event is not None and self._finished_event.is_set()
+
+    def open(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            return
+
+        if self.finished:
+            return
+
+        if self.process is not None:
+            print(f"[Capture] ❌ Process died → {self.camera_code} (exitcode={self.process.exitcode}); restarting")
+            self.stop()
+
+        self.ring = SharedFrameRing(create=True)
+        self._stop_event = _ctx.Event()
+        self._finished_event = _ctx.Event()
+        self._last_seq = 0
+
+        self.process = _ctx.Process(
+            target=_capture_main,
+            args=(
+                self.camera_code,
+                self.source_url,
+                self.ai_fps,
+                self.ring.name,
+                self.ring.slots,
+                self.ring.max_height,
+                self.ring.max_width,
+                self._stop_event,
+                _shared_connect_slots(),
+                self._finished_event,
+            ),
+            name=f"capture-{self.camera_code}",
+            daemon=True,
+        )
+        self.process.start()
+
+    def read(self, timeout: float) -> Optional[Tuple[np.ndarray, float, float]]:
+        item = self.ring.wait_latest(self._last_seq, timeout)
+        if item is None:
+            return None
+
+        seq, frame, timestamp, captured_at = item
+        self._last_seq = seq
+        return frame, timestamp, captured_at
+
+    def release(self, frame: Optional[np.ndarray]) -> None:
+        # Ring views are recycled by the next read(); nothing to return.
+        pass
+
+    def close(self) -> None:
+        # Stream reconnects happen inside the capture process; only a dead process needs a restart.
+        if self.process is not None and not self.process.is_alive() and not self.finished:
+            self.stop()
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self._stop_event.set()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring.unlink()
+            self.ring = None
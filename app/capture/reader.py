@@ -0,0 +1,262 @@
+import os
+import time
+import threading
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from .fingerprint import frame_fingerprint
+from .frame_pool import FramePool
+
+CAPTURE_STATS_INTERVAL = float(os.getenv("CAPTURE_STATS_INTERVAL", "30.0"))
+# read failures: sleep between retries (doubling), give up after CAPTURE_READ_FAIL_TIMEOUT
+CAPTURE_READ_BACKOFF_INITIAL = float(os.getenv("CAPTURE_READ_BACKOFF_INITIAL", "0.01"))
+CAPTURE_READ_BACKOFF_MAX = float(os.getenv("CAPTURE_READ_BACKOFF_MAX", "0.5"))
+CAPTURE_READ_FAIL_TIMEOUT = float(os.getenv("CAPTURE_READ_FAIL_TIMEOUT", "3.0"))
+# stream clock (frame pts) not advancing for this long → stalled
+CAPTURE_STALL_TIMEOUT = float(os.getenv("CAPTURE_STALL_TIMEOUT", "5.0"))
+# consecutive pixel-identical frames (fingerprint) for this long AND at least this many → frozen;
+# static compressed scenes can decode bit-identical for a while, so both are generous. 0 disables.
+CAPTURE_FROZEN_TIMEOUT = float(os.getenv("CAPTURE_FROZEN_TIMEOUT", "10.0"))
+CAPTURE_FROZEN_MIN_FRAMES = int(os.getenv("CAPTURE_FROZEN_MIN_FRAMES", "50"))
+# while duplicates are being skipped, still deliver one this often so consumers see a live stream
+CAPTURE_DUPLICATE_KEEPALIVE = float(os.getenv("CAPTURE_DUPLICATE_KEEPALIVE", "1.0"))
+
+
+class CaptureReader:
+    """
+    Pulls frames from an opened capture and hands them to `on_frame`.
+
+    With ai_fps > 0 the reader runs in decimation mode:
+    - grab() on every packet (keeps the decoder and RTSP buffer in sync)
+    - retrieve() only at the configured AI rate (BGR conversion is the expensive part)
+
+    With ai_fps <= 0 every frame is retrieved, same as cap.read().
+
+    With a `demand` event the reader only retrieves when the event is set
+    (on-demand decoding, e.g. the main stream in dual-stream mode).
+
+    on_frame(frame, timestamp, captured_at): timestamp is epoch seconds, taken
+    from the source clock when the capture has one (replay), else wall-clock at grab.
+    Decimation follows the same clock, so fast replays decimate deterministically.
+    captured_at is time.monotonic() at grab, for latency measurement.
+
+    With a `pool` frames are decoded into preallocated buffers; whoever ends up
+    with a frame returns it through pool.release().
+
+    run() returns why it stopped:
+    - "stopped":     stop_event was set
+    - "finished":    replay source reached its end
+    - "read_failed": grab() kept failing for CAPTURE_READ_FAIL_TIMEOUT (with backoff in between)
+    - "stalled":     grabs succeed but the stream clock stopped for CAPTURE_STALL_TIMEOUT
+    - "frozen":      at least CAPTURE_FROZEN_MIN_FRAMES consecutive identical pictures
+                     spanning CAPTURE_FROZEN_TIMEOUT, measured from the first repeat
+
+    Repeated frames (same fingerprint as the previous decoded frame) are passed
+    to on_frame only once per CAPTURE_DUPLICATE_KEEPALIVE, so a frozen or static
+    feed costs little inference while it lasts. Replays and demand mode (frames
+    only decoded on request, gaps between them are expected) skip the check.
+    """
+
+    def __init__(
+        self,
+        camera_code: str,
+        on_frame: Callable[[np.ndarray, float, float], None],
+        stop_event: threading.Event,
+        ai_fps: float = 0,
+        stats_interval: float = CAPTURE_STATS_INTERVAL,
+        demand: Optional[threading.Event] = None,
+        read_fail_timeout: float = CAPTURE_READ_FAIL_TIMEOUT,
+        stall_timeout: float = CAPTURE_STALL_TIMEOUT,
+        pool: Optional[FramePool] = None,
+        frozen_timeout: float = CAPTURE_FROZEN_TIMEOUT,
+        frozen_min_frames: int = CAPTURE_FROZEN_MIN_FRAMES,
+    ):
+        self.camera_code = camera_code
+        self.on_frame = on_frame
+        self.stop_event = stop_event
+        self.interval = 1.0 / ai_fps if ai_fps and ai_fps > 0 else 0.0
+        self.stats_interval = stats_interval
+        self.demand = demand
+        self.read_fail_timeout = read_fail_timeout
+        self.stall_timeout = stall_timeout
+        self.pool = pool
+        self.frozen_timeout = frozen_timeout
+        self.frozen_min_frames = frozen_min_frames
+
+        self._next_due = None
+        self.last_frame_at = time.monotonic()
+        self.last_grab_at = self.last_frame_at
+
+        # counters since last report
+        self._grabbed = 0
+        self._decoded = 0
+        self._dropped = 0
+        self._duplicates = 0
+        self._last_report = time.monotonic()
+
+        self._last_stats = {"grabbed_fps": 0.0, "decoded_fps": 0.0, "dropped_fps": 0.0, "duplicate_fps": 0.0}
+
+    # -----------------------------
+    # MAIN LOOP
+    # -----------------------------
+    def run(self, cap) -> str:
+        self._next_due = None
+        self.last_frame_at = time.monotonic()
+        self.last_grab_at = self.last_frame_at
+
+        frame_time = getattr(cap, "frame_time", None)
+
+        fail_since = None
+        backoff = CAPTURE_READ_BACKOFF_INITIAL
+        last_pts = None
+        pts_changed_at = self.last_grab_at
+        last_fingerprint = None
+        repeat_since = None     # first duplicate of the current run of identical frames
+        repeats = 0
+
+        while not self.stop_event.is_set():
+            if not cap.grab():
+                if getattr(cap, "finished", False):
+                    return "finished"
+
+                now = time.monotonic()
+                if fail_since is None:
+                    fail_since = now
+                elif now - fail_since > self.read_fail_timeout:
+                    return "read_failed"
+
+                self.stop_event.wait(backoff)
+                backoff = min(backoff * 2, CAPTURE_READ_BACKOFF_MAX)
+                continue
+
+            fail_since = None
+            backoff = CAPTURE_READ_BACKOFF_INITIAL
+
+            self._grabbed += 1
+            now = time.monotonic()
+            self.last_grab_at = now
+
+            if frame_time is not None:
+                ts = frame_time()
+            else:
+                ts = time.time()
+
+                # stream clock (pts); <= 0 for sources that do not report one (webcam)
+                pts = cap.get(cv2.CAP_PROP_POS_MSEC)
+                if pts > 0 and pts != last_pts:
+                    last_pts = pts
+                    pts_changed_at = now
+                elif pts > 0 and now - pts_changed_at > self.stall_timeout:
+                    return "stalled"
+
+            if not self._is_due(ts):
+                self._dropped += 1
+                self._maybe_report(now)
+                continue
+
+            ret, frame = self._retrieve(cap)
+            if not ret or frame is None:
+                continue
+
+            self._decoded += 1
+
+            # replays may legitimately repeat pictures; keep them deterministic
+            if self.frozen_timeout > 0 and frame_time is None and self.demand is None:
+                fingerprint = frame_fingerprint(frame)
+                if fingerprint == last_fingerprint:
+                    self._duplicates += 1
+                    repeats += 1
+                    if repeat_since is None:
+                        repeat_since = now
+                    elif repeats >= self.frozen_min_frames and now - repeat_since >= self.frozen_timeout:
+                        if self.pool is not None:
+                            self.pool.release(frame)
+                        return "frozen"
+
+                    if now - self.last_frame_at < CAPTURE_DUPLICATE_KEEPALIVE:
+                        if self.pool is not None:
+                            self.pool.release(frame)
+                        self._maybe_report(now)
+                        continue
+                else:
+                    last_fingerprint = fingerprint
+                    repeat_since = None
+                    repeats = 0
+
+            self.last_frame_at = now
+            self.on_frame(frame, ts, now)
+            self._maybe_report(now)
+
+        return "stopped"
+
+    def _retrieve(self, cap):
+        if self.pool is None:
+            return cap.retrieve()
+
+        buf = self.pool.acquire()
+        ret, frame = cap.retrieve(buf) if buf is not None else cap.retrieve()
+
+        if not ret or frame is None:
+            self.pool.release(buf)
+            return False, None
+
+        self.pool.adopt(buf, frame)
+        return True, frame
+
+    def _is_due(self, ts: float) -> bool:
+        if self.demand is not None:
+            if not self.demand.is_set():
+                return False
+            self.demand.clear()
+            return True
+
+        if not self.interval:
+            return True
+
+        if self._next_due is not None and ts < self._next_due:
+            return False
+
+        # keep a steady cadence, but never try to "catch up" after a stall
+        if self._next_due is None:
+            self._next_due = ts
+        self._next_due += self.interval
+        if self._next_due < ts:
+            self._next_due = ts + self.interval
+
+        return True
+
+    # -----------------------------
+    # STATS
+    # -----------------------------
+    def _maybe_report(self, now: float) -> None:
+        elapsed = now - self._last_report
+        if elapsed < self.stats_interval:
+            return
+
+        self._last_stats = {
+            "grabbed_fps": self._grabbed / elapsed,
+            "decoded_fps": self._decoded / elapsed,
+            "dropped_fps": self._dropped / elapsed,
+            "duplicate_fps": self._duplicates / elapsed,
+        }
+
+        print(
+            f"[Capture] {self.camera_code} grabbed={self._last_stats['grabbed_fps']:.1f}/s "
+            f"decoded={self._last_stats['decoded_fps']:.1f}/s "
+            f"dropped={self._last_stats['dropped_fps']:.1f}/s "
+            f"duplicate={self._last_stats['duplicate_fps']:.1f}/s"
+        )
+
+        self._grabbed = 0
+        self._decoded = 0
+        self._dropped = 0
+        self._duplicates = 0
+        self._last_report = now
+
+    def stats(self) -> dict:
+        """
+        Rates (frames/sec) measured over the last reporting interval.
+        """
+        return dict(self._last_stats)
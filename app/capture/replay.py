@@ -0,0 +1,180 @@
+import os
+import time
+from typing import List
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import cv2
+import numpy as np
+
+REPLAY_PACING = os.getenv("REPLAY_PACING", "realtime").strip().lower()
+REPLAY_DEFAULT_FPS = float(os.getenv("REPLAY_DEFAULT_FPS", "25"))
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class ImageSequenceCapture:
+    """
+    cv2.VideoCapture-like reader over a directory of images (sorted by name).
+    grab() only advances the cursor; retrieve() decodes the image.
+    """
+
+    def __init__(self, directory: str, fps: float = REPLAY_DEFAULT_FPS):
+        self.files: List[str] = sorted(
+            os.path.join(directory, f)
+            for f in os.listdir(directory)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.fps = fps
+        self.index = -1
+
+    def isOpened(self) -> bool:
+        return bool(self.files)
+
+    def grab(self) -> bool:
+        if self.index + 1 >= len(self.files):
+            return False
+        self.index += 1
+        return True
+
+    def retrieve(self, image=None, flag=None):
+        frame = cv2.imread(self.files[self.index], cv2.IMREAD_COLOR)
+        return frame is not None, frame
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.index + 1
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.files)
+        return 0.0
+
+    def set(self, prop, value) -> bool:
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.index = int(value) - 1
+            return True
+        return False
+
+    def release(self) -> None:
+        self.files = []
+
+
+class ReplayCapture:
+    """
+    Paces a recorded source like a live camera.
+
+    pacing="realtime": grab() sleeps so frames come out at the source fps.
+    pacing="fast":     no sleeping. Frames are marked lossless: consumers
+                       should queue, not drop.
+
+    In both modes frame timestamps come from frame_time() (start + frame_index / fps),
+    so they follow the recording's schedule and runs are reproducible.
+    With loop=False the end of the source is final (the reader returns "finished").
+    """
+
+    def __init__(self, cap, fps: float, pacing: str = REPLAY_PACING, loop: bool = False):
+        if pacing not in ("realtime", "fast"):
+            raise ValueError(f"Unknown replay pacing: {pacing}")
+
+        self.cap = cap
+        self.fps = fps if fps and fps > 0 else REPLAY_DEFAULT_FPS
+        self.pacing = pacing
+        self.loop = loop
+        self.lossless = pacing == "fast"
+
+        self.frame_index = -1
+        self.finished = False
+        self._start_wall = time.time()
+        self._start_clock = time.monotonic()
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def grab(self) -> bool:
+        if self.finished:
+            return False
+
+        if not self.cap.grab():
+            if not self.loop:
+                self.finished = True
+                elapsed = time.monotonic() - self._start_clock
+                print(
+                    f"[Replay] Finished after {self.frame_index + 1} frames in {elapsed:.1f}s "
+                    f"({(self.frame_index + 1) / max(elapsed, 1e-6):.1f} fps)"
+                )
+                return False
+
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            if not self.cap.grab():
+                self.finished = True
+                return False
+
+        self.frame_index += 1
+
+        if self.pacing == "realtime":
+            due = self._start_clock + self.frame_index / self.fps
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        return True
+
+    def frame_time(self) -> float:
+        """
+        Timestamp (epoch seconds) of the last grabbed frame.
+        """
+        return self._start_wall + self.frame_index / self.fps
+
+    def retrieve(self, image=None, flag=None):
+        if image is not None:
+            return self.cap.retrieve(image)
+        return self.cap.retrieve()
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return self.cap.get(prop)
+
+    def set(self, prop, value) -> bool:
+        return self.cap.set(prop, value)
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+def open_file_source(url: str) -> ReplayCapture:
+    """
+    file:///path/to/video.mp4?pace=fast&loop=1&fps=25
+    file:///path/to/image_dir?pace=realtime
+
+    pace: realtime | fast (default REPLAY_PACING)
+    loop: rewind at end of file
+    fps:  override source fps (required for image sequences, default REPLAY_DEFAULT_FPS)
+    """
+    parts = urlsplit(url)
+    path = unquote(parts.netloc + parts.path)
+    query = parse_qs(parts.query)
+
+    pacing = query.get("pace", [REPLAY_PACING])[0].lower()
+    loop = query.get("loop", ["0"])[0].lower() in ("1", "true", "yes")
+    fps_override = float(query["fps"][0]) if "fps" in query else None
+
+    if os.path.isdir(path):
+        cap = ImageSequenceCapture(path, fps=fps_override or REPLAY_DEFAULT_FPS)
+    else:
+        cap = cv2.VideoCapture(path)
+
+    fps = fps_override or cap.get(cv2.CAP_PROP_FPS)
+    print(f"[Replay] {path} fps={fps} pace={pacing} loop={loop}")
+
+    return ReplayCapture(cap, fps=fps, pacing=pacing, loop=loop)
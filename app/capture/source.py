@@ -0,0 +1,32 @@
+import os
+import cv2
+
+from .replay import open_file_source
+
+RTSP_TRANSPORT = os.getenv("RTSP_TRANSPORT", "tcp").strip().lower()
+RTSP_TIMEOUT_US = int(os.getenv("RTSP_TIMEOUT_US", "5000000"))
+RTSP_BUFFER_SIZE = int(os.getenv("RTSP_BUFFER_SIZE", "1024000"))
+CAPTURE_BACKOFF_INITIAL = float(os.getenv("CAPTURE_BACKOFF_INITIAL", "1.0"))
+CAPTURE_BACKOFF_MAX = float(os.getenv("CAPTURE_BACKOFF_MAX", "30.0"))
+
+
+def open_capture(rtsp_url: str):
+    if isinstance(rtsp_url, str) and rtsp_url.lower() == "webcam":
+        print("[Camera] Using webcam source")
+        cap = cv2.VideoCapture(0)
+        print("Camera FPS:", "webcam", cap.get(cv2.CAP_PROP_FPS))
+        return cap
+
+    if isinstance(rtsp_url, str) and rtsp_url.lower().startswith("file://"):
+        return open_file_source(rtsp_url)
+
+    ffmpeg_options = [f"rtsp_transport;{RTSP_TRANSPORT}", f"stimeout;{RTSP_TIMEOUT_US}", f"buffer_size;{RTSP_BUFFER_SIZE}"]
+    os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "|".join(ffmpeg_options)
+
+    cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
+    try:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    except Exception:
+        pass
+    print("Camera FPS:", rtsp_url, cap.get(cv2.CAP_PROP_FPS))
+    return cap
@@ -0,0 +1,153 @@
+import os
+import time
+import random
+import threading
+from collections import defaultdict
+from enum import Enum
+from typing import Callable, Optional
+
+from .reader import CaptureReader
+from .source import open_capture, CAPTURE_BACKOFF_INITIAL, CAPTURE_BACKOFF_MAX
+
+# consecutive failed connects before a camera is declared DOWN
+CAPTURE_DOWN_AFTER = int(os.getenv("CAPTURE_DOWN_AFTER", "5"))
+CAPTURE_DOWN_RETRY_SEC = float(os.getenv("CAPTURE_DOWN_RETRY_SEC", "60.0"))
+# max cameras opening a stream at the same time (per process)
+CAPTURE_RECONNECT_CONCURRENCY = int(os.getenv("CAPTURE_RECONNECT_CONCURRENCY", "4"))
+
+connect_slots = threading.BoundedSemaphore(CAPTURE_RECONNECT_CONCURRENCY)
+
+
+class CameraState(str, Enum):
+    CONNECTING = "CONNECTING"
+    CONNECTED = "CONNECTED"
+    RECONNECTING = "RECONNECTING"
+    DOWN = "DOWN"
+
+
+class CameraSupervisor:
+    """
+    Owns the connection lifecycle of one camera stream.
+
+    CONNECTING → CONNECTED → (read failures / stall / frozen) → RECONNECTING → CONNECTED
+                                    ↓ CAPTURE_DOWN_AFTER failed connects
+                                   DOWN (retry every CAPTURE_DOWN_RETRY_SEC)
+
+    A replay that reached its end ("finished") is terminal: `finished` is set and
+    run() returns for good.
+
+    - Connect attempts use jittered exponential backoff and a shared semaphore,
+      so a site-wide network blip does not reconnect every camera at once.
+    - The CaptureReader handles read-failure backoff, stall and frozen-frame detection and
+      returns why it stopped; the supervisor decides what to do next.
+    - Time spent in each state is accumulated (stats()).
+    """
+
+    def __init__(
+        self,
+        camera_code: str,
+        source_url: str,
+        reader: CaptureReader,
+        stop_event: threading.Event,
+        slots=None,
+        on_connect: Optional[Callable] = None,
+    ):
+        self.camera_code = camera_code
+        self.source_url = source_url
+        self.reader = reader
+        self.stop_event = stop_event
+        self.slots = slots if slots is not None else connect_slots
+        self.on_connect = on_connect
+
+        self.state = CameraState.CONNECTING
+        self._state_since = time.monotonic()
+        self.time_in_state = defaultdict(float)
+        self.reconnects = 0
+        self.finished = False
+
+    # -----------------------------
+    # STATE
+    # -----------------------------
+    def _set_state(self, state: CameraState, reason: str = "") -> None:
+        now = time.monotonic()
+        previous = self.state
+        spent = now - self._state_since
+
+        self.time_in_state[previous] += spent
+        self.state = state
+        self._state_since = now
+
+        if state != previous:
+            suffix = f" ({reason})" if reason else ""
+            print(f"[Capture] {self.camera_code} {previous.value} → {state.value}{suffix} after {spent:.1f}s")
+
+    def stats(self) -> dict:
+        times = dict(self.time_in_state)
+        times[self.state] = times.get(self.state, 0.0) + time.monotonic() - self._state_since
+
+        return {
+            "state": self.state.value,
+            "reconnects": self.reconnects,
+            "time_in_state": {s.value: round(t, 1) for s, t in times.items()},
+            **self.reader.stats(),
+        }
+
+    # -----------------------------
+    # CONNECT
+    # -----------------------------
+    def _connect(self):
+        backoff = CAPTURE_BACKOFF_INITIAL
+        failures = 0
+
+        while not self.stop_event.is_set():
+            with self.slots:
+                cap = open_capture(self.source_url)
+
+            if cap.isOpened():
+                return cap
+
+            cap.release()
+            failures += 1
+
+            if failures >= CAPTURE_DOWN_AFTER:
+                self._set_state(CameraState.DOWN, f"{failures} failed connects")
+                sleep_time = CAPTURE_DOWN_RETRY_SEC
+            else:
+                sleep_time = min(backoff, CAPTURE_BACKOFF_MAX)
+                backoff = min(backoff * 2, CAPTURE_BACKOFF_MAX)
+
+            sleep_time *= random.uniform(0.8, 1.2)
+            print(f"[Camera] ❌ Connect failed → {self.camera_code}; retry in {sleep_time:.1f}s")
+            self.stop_event.wait(sleep_time)
+
+        return None
+
+    # -----------------------------
+    # MAIN LOOP
+    # -----------------------------
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            cap = self._connect()
+            if cap is None:
+                break
+
+            if self.on_connect is not None:
+                self.on_connect(cap)
+
+            self._set_state(CameraState.CONNECTED)
+
+            try:
+                reason = self.reader.run(cap)
+            finally:
+                cap.release()
+
+            if reason in ("stopped", "finished"):
+                self.finished = reason == "finished"
+                self._set_state(CameraState.DOWN, reason)
+                break
+
+            self.reconnects += 1
+            self._set_state(CameraState.RECONNECTING, reason)
+
+            # small jittered pause so a whole site does not hammer the NVR in lockstep
+            self.stop_event.wait(CAPTURE_BACKOFF_INITIAL * random.uniform(0.5, 1.5))
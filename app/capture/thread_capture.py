@@ -0,0 +1,138 @@
+import threading
+from queue import Queue, Empty, Full
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .frame_pool import FramePool
+from .reader import CaptureReader
+from .supervisor import CameraSupervisor
+
+
+class ThreadCapture:
+    """
+    Capture running as a supervisor thread inside the current process.
+    Only the newest frame is kept; older ones are dropped, except for
+    lossless sources (fast replay) where the reader waits for the consumer.
+
+    Connecting and reconnecting are handled by the CameraSupervisor;
+    open() only starts it and close() is a no-op. Once a replay has finished,
+    `finished` is True and open() no longer restarts it.
+
+    Frames come from a small FramePool: hand each one back with release()
+    once it is no longer used (dropped frames are returned automatically).
+    """
+
+    def __init__(self, camera_code: str, source_url: str, ai_fps: float = 0, connect_slots=None):
+        self.camera_code = camera_code
+        self.source_url = source_url
+
+        self.frame_queue = Queue(maxsize=1)
+        self.stop_event = threading.Event()
+        self.pool = FramePool()
+        self.reader = CaptureReader(
+            camera_code,
+            on_frame=self._push_latest,
+            stop_event=self.stop_event,
+            ai_fps=ai_fps,
+            pool=self.pool,
+        )
+        self.supervisor = CameraSupervisor(
+            camera_code,
+            source_url,
+            self.reader,
+            self.stop_event,
+            slots=connect_slots,
+            on_connect=self._on_connect,
+        )
+
+        self._thread = None
+        self._lossless = False
+
+    def _on_connect(self, cap) -> None:
+        self._lossless = getattr(cap, "lossless", False)
+
+    def _push_latest(self, frame: np.ndarray, timestamp: float, captured_at: float) -> None:
+        item = (frame, timestamp, captured_at)
+
+        if self._lossless:
+            while not self.stop_event.is_set():
+                try:
+                    self.frame_queue.put(item, timeout=0.5)
+                    return
+                except Full:
+                    continue
+            return
+
+        if self.frame_queue.full():
+            try:
+                dropped = self.frame_queue.get_nowait()  # drop old frame
+                self.pool.release(dropped[0])
+            except Empty:
+                pass
+
+        self.frame_queue.put(item)
+
+    @property
+    def state(self):
+        return self.supervisor.state
+
+    def stats(self) -> dict:
+        return self.supervisor.stats()
+
+    @property
+    def finished(self) -> bool:
+        """
+        End of a non-looping replay, and every frame has been read.
+        """
+        return self.supervisor.finished and self.frame_queue.empty()
+
+    def open(self) -> None:
+        """
+        Start the supervisor thread (idempotent; never restarts a finished replay).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        if self.supervisor.finished:
+            return
+
+        self.stop_event.clear()
+
+        self._thread = threading.Thread(
+            target=self.supervisor.run,
+            name=f"capture-{self.camera_code}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def read(self, timeout: float) -> Optional[Tuple[np.ndarray, float, float]]:
+        """
+        Returns (frame, timestamp, captured_at) or None if nothing arrived within timeout.
+        """
+        try:
+            return self.frame_queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def release(self, frame: Optional[np.ndarray]) -> None:
+        """
+        Return a frame from read() to the pool; it must not be used afterwards.
+        """
+        self.pool.release(frame)
+
+    def close(self) -> None:
+        # Stream reconnects are the supervisor's job.
+        pass
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout=5)   # wait for thread to exit safely
+            self._thread = None
+
+        try:
+            self.pool.release(self.frame_queue.get_nowait()[0])
+        except Empty:
+            pass
@@ -16,6 +16,8 @@ class EnvConfig:
     NODE_CREATE_UNKNOWN_URL = os.getenv("NODE_CREATE_UNKNOWN_URL")
     NODE_UPDATE_UNKNOWN_URL = os.getenv("NODE_UPDATE_UNKNOWN_URL")
     CAMERA_API_URL = os.getenv("CAMERA_API_URL")
+    # Local JSON camera list (same shape as the camera API); used instead of CAMERA_API_URL when set
+    CAMERA_MANIFEST = os.getenv("CAMERA_MANIFEST")
     # Global override: when true, force using local webcam instead of RTSP streams
     USE_WEBCAM = os.getenv("USE_WEBCAM", "false").lower() in ("1", "true", "yes")
     MIN_UNKNOWN_FRAMES = 4
@@ -29,5 +31,11 @@ class EnvConfig:
     MIN_UNKNOWN_CREATION_QUALITY = float(os.getenv("MIN_UNKNOWN_CREATION_QUALITY"))
     MIN_UNKNOWN_CREATE_FRAMES = int(os.getenv("MIN_UNKNOWN_CREATE_FRAMES", "2"))
     SCRFD_THRESHOLD = float(os.getenv("SCRFD_THRESHOLD", "0.50"))
+    # Face embedding model: "arcface" (buffalo_l) or "adaface" (models/adaface). Galleries are per model.
+    FACE_EMBEDDER = os.getenv("FACE_EMBEDDER", "arcface").strip().lower()
+    # Default for cameras whose streamConfig does not set motionGate
+    MOTION_GATE = os.getenv("MOTION_GATE", "false").lower() in ("1", "true", "yes")
+    # Default for cameras whose streamConfig does not set detectEvery (1 = detect every frame)
+    DETECT_EVERY = int(os.getenv("DETECT_EVERY", "1"))
 
 envConfig = EnvConfig()  
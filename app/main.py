@@ -1,11 +1,14 @@
 import time
 import threading
-from app.api.run_server import start_api
-from app.camera import fetch_cameras, start_camera_threads
-from app.recognition import embedding_store, unknown_embedding_store
-from app.api.server import wait_for_api
+
+# CAPTURE_MODE=process spawns capture children, and "spawn" re-imports this module in
+# each of them: the app imports (models, Redis) stay inside main() so children skip them.
 
 def main():
+    from app.api.run_server import start_api
+    from app.camera import fetch_cameras, start_camera_threads
+    from app.recognition import embedding_store, unknown_embedding_store
+
     print("\n🚀 Starting Live Face Tracking System\n")
 
     try:
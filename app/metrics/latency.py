@@ -0,0 +1,37 @@
+# app/metrics/latency.py
+
+import time
+
+
+class FrameLatency:
+    """
+    Glass-to-event timing for one frame.
+
+    captured_at is the monotonic time the capture grabbed the frame
+    (CLOCK_MONOTONIC is system-wide, so this holds across capture processes).
+    mark(stage) books the time since the previous mark onto `stage`;
+    stages hit several times per frame (one face pass per track) accumulate.
+
+    Timings are per frame, not per track: an event for one track reports the
+    frame's stages up to that event, including work done for tracks handled
+    earlier in the same frame (face detection runs once for all of them).
+    """
+
+    def __init__(self, captured_at: float):
+        self.captured_at = captured_at
+        self.stages = {}
+        self._last = captured_at
+
+    def mark(self, stage: str) -> None:
+        now = time.monotonic()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def payload(self) -> dict:
+        """
+        Event payload fragment: total and per-stage milliseconds so far.
+        """
+        return {
+            "totalMs": round((time.monotonic() - self.captured_at) * 1000, 1),
+            "stagesMs": {k: round(v * 1000, 1) for k, v in self.stages.items()},
+        }
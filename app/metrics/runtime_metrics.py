@@ -1,37 +1,51 @@
 # app/metrics/runtime_metrics.py
 
+import threading
 import time
 from collections import defaultdict
 
 class RuntimeMetrics:
+    """
+    Process-wide counters/timers shared by all camera threads; every access holds the lock
+    and log() prints a snapshot taken under it.
+    """
+
     def __init__(self):
         self.counters = defaultdict(int)
         self.timers = defaultdict(float)
         self.last_log = time.time()
+        self._lock = threading.Lock()
 
     def inc(self, key: str, value: int = 1):
-        self.counters[key] += value
+        with self._lock:
+            self.counters[key] += value
 
     def add_time(self, key: str, duration: float):
-        self.timers[key] += duration
+        with self._lock:
+            self.timers[key] += duration
 
     def log(self, interval: float = 5.0):
-        now = time.time()
-        if now - self.last_log < interval:
-            return
+        with self._lock:
+            now = time.time()
+            if now - self.last_log < interval:
+                return
+
+            elapsed = now - self.last_log
+            counters = dict(self.counters)
+            timers = dict(self.timers)
+
+            self.counters.clear()
+            self.timers.clear()
+            self.last_log = now
 
         print("\n===== RUNTIME METRICS =====")
-        for k, v in self.counters.items():
-            print(f"{k}: {v / interval:.2f}/sec")
+        for k, v in counters.items():
+            print(f"{k}: {v / elapsed:.2f}/sec")
 
-        for k, v in self.timers.items():
-            print(f"{k}_avg: {(v / max(self.counters.get(k+'_count',1),1)):.4f}s")
+        for k, v in timers.items():
+            print(f"{k}_avg: {(v / max(counters.get(k+'_count',1),1)):.4f}s")
 
         print("===========================\n")
 
-        self.counters.clear()
-        self.timers.clear()
-        self.last_log = now
-
 
-metrics = RuntimeMetrics()
\ No newline at end of file
+metrics = RuntimeMetrics()
@@ -12,6 +12,8 @@ class EmbeddingStore:
         self.employee_ids = []
         self.employee_names = []
         self.embeddings = None  # numpy matrix (N x 512)
+        # vectors from another embedding model are not comparable → never loaded
+        self.embedding_model = envConfig.FACE_EMBEDDER
 
     def load_embeddings(self):
         print("[AI] Loading employee embeddings...")
@@ -32,9 +34,15 @@ class EmbeddingStore:
             return
 
         vectors = []
+        skipped = 0
 
         for emp in employees:
 
+            # records from before models were tracked are ArcFace
+            if emp.get("embeddingModel", "arcface") != self.embedding_model:
+                skipped += 1
+                continue
+
             mean_embedding = np.array(emp["meanEmbedding"], dtype=np.float32)
 
             # normalize (safety)
@@ -44,9 +52,16 @@ class EmbeddingStore:
             self.employee_names.append(emp["name"])
             vectors.append(mean_embedding)
 
+        if skipped:
+            print(f"[AI] ⚠️ Skipped {skipped} employee embeddings not produced by {self.embedding_model}")
+
+        if not vectors:
+            print(f"[AI] ⚠️ No {self.embedding_model} employee embeddings → running in UNKNOWN-ONLY mode")
+            return
+
         self.embeddings = np.stack(vectors)
 
-        print(f"[AI] Loaded {len(self.employee_ids)} employee embeddings")
+        print(f"[AI] Loaded {len(self.employee_ids)} employee embeddings ({self.embedding_model})")
 
     def find_match(self, embedding, threshold=0.45):
         """
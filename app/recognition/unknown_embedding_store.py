@@ -413,6 +413,8 @@ class UnknownEmbeddingStore:
     def __init__(self, api_url, embedding_dim=512):
         self.api_url = api_url
         self.embedding_dim = embedding_dim
+        # unknowns from another embedding model are not comparable → never loaded
+        self.embedding_model = envConfig.FACE_EMBEDDER
 
         self._store = StoreData(
             centroid_matrix=np.empty((0, embedding_dim), dtype=np.float32),
@@ -471,7 +473,8 @@ class UnknownEmbeddingStore:
             "centroid_embedding": json.dumps(centroid.tolist()),
             "embedding_count": str(payload.get("embedding_count", 0)),
             "poses": json.dumps(clean_poses),
-            "builder_stats": json.dumps(payload.get("builder_stats", {}))
+            "builder_stats": json.dumps(payload.get("builder_stats", {})),
+            "embedding_model": self.embedding_model
         }
 
         return centroid, clean_poses, data, files
@@ -582,6 +585,7 @@ class UnknownEmbeddingStore:
             "timestamp": str(timestamp),
             "cameraCode": str(camera_code),
             "poses": json.dumps(clean_poses),
+            "embeddingModel": self.embedding_model,
         }
 
         return centroid_arr, clean_poses, data, files
@@ -673,6 +677,10 @@ class UnknownEmbeddingStore:
 
         pose_idx = 0
         for u in data:
+            # records from before models were tracked are ArcFace
+            if u.get("embeddingModel", "arcface") != self.embedding_model:
+                continue
+
             uid = u["id"]
             unknown_ids.append(uid)
             uid_to_pose_quality[uid] = {}
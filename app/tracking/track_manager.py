@@ -208,6 +208,8 @@ class TrackEventEmitter:
     - Track lifecycle (created, updated, lost)
     - Deduplicate events per track
     - Emit events via publisher
+    - Attach the frame's stage timings (FrameLatency) when the caller has them;
+      they are per frame, not per track (see FrameLatency)
 
     Does NOT:
     - Handle recognition logic
@@ -242,6 +244,12 @@ class TrackEventEmitter:
         track["emitted_events"].add(event_type)
         self.publisher.publish(event_type, payload)
 
+    @staticmethod
+    def _with_latency(payload, latency):
+        if latency is not None:
+            payload["latency"] = latency.payload()
+        return payload
+
     # -----------------------------
     # TRACK LIFECYCLE
     # -----------------------------
@@ -276,36 +284,36 @@ class TrackEventEmitter:
     # -----------------------------
     # FACE EVENT
     # -----------------------------
-    def face_detected(self, cam_code, person_id):
+    def face_detected(self, cam_code, person_id, latency=None):
         person_id = int(person_id)
 
         self._emit_once(
             person_id,
             "face_detected",
-            {
+            self._with_latency({
                 "camera_code": cam_code,
                 "track_id": person_id,
                 "eventTs": int(time.time() * 1000)
-            }
+            }, latency)
         )
 
     # -----------------------------
     # RECOGNITION EVENTS
     # -----------------------------
-    def recognition_pending(self, cam_code, person_id):
+    def recognition_pending(self, cam_code, person_id, latency=None):
         person_id = int(person_id)
 
         self._emit_once(
             person_id,
             "recognition_pending",
-            {
+            self._with_latency({
                 "camera_code": cam_code,
                 "track_id": person_id,
                 "eventTs": int(time.time() * 1000)
-            }
+            }, latency)
         )
 
-    def recognition_confirmed(self, cam_code, person_id, identity_id, similarity):
+    def recognition_confirmed(self, cam_code, person_id, identity_id, similarity, latency=None):
         person_id = int(person_id)
         track = self.tracks.get(person_id)
         if not track:
@@ -322,6 +330,7 @@ class TrackEventEmitter:
             "frame_height": track["frame_height"],
             "eventTs": int(time.time() * 1000)
         }
+        self._with_latency(payload, latency)
 
         # Gate events (emit once as well)
         if self.gate_type == "ENTRY":
@@ -330,7 +339,7 @@ class TrackEventEmitter:
         elif self.gate_type == "EXIT":
             self._emit_once(person_id, "person_exited", payload)
 
-    def unknown_confirmed(self, cam_code, person_id, unknown_id):
+    def unknown_confirmed(self, cam_code, person_id, unknown_id, latency=None):
         person_id = int(person_id)
         track = self.tracks.get(person_id)
         if not track:
@@ -346,6 +355,7 @@ class TrackEventEmitter:
             "frame_height": track["frame_height"],
             "eventTs": int(time.time() * 1000)
         }
+        self._with_latency(payload, latency)
 
         if self.gate_type == "ENTRY":
             self._emit_once(person_id, "unknown_entered", payload)
@@ -0,0 +1,102 @@
+"""
+IoU matching benchmark: old per-pair Python loops vs numpy IoU matrix + lap.
+
+    python -m benchmarks.bench_iou
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.ai.box_ops import iou_matrix
+from app.ai.remove_duplicate_detections import remove_duplicate_detections
+from app.ai.tracking.tracker import SimpleTracker
+
+SIZES = (10, 50, 200)
+REPEAT = 20
+
+
+@dataclass
+class _Det:
+    bbox: np.ndarray
+
+
+def _loop_iou(a, b):
+    x1 = max(a[0], b[0])
+    y1 = max(a[1], b[1])
+    x2 = min(a[2], b[2])
+    y2 = min(a[3], b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0
+
+
+def _loop_dedup(detections, threshold=0.8):
+    filtered = []
+    for d in detections:
+        if not any(_loop_iou(d.bbox, f.bbox) > threshold for f in filtered):
+            filtered.append(d)
+    return filtered
+
+
+def _loop_match(tracks, detections, threshold=0.3):
+    # old SimpleTracker.update: greedy first match per detection
+    matched = []
+    for det in detections:
+        for t_idx, track in enumerate(tracks):
+            if _loop_iou(track, det) > threshold:
+                matched.append(t_idx)
+                break
+    return matched
+
+
+def _boxes(n, rng):
+    xy = rng.uniform(0, 1800, size=(n, 2))
+    wh = rng.uniform(40, 200, size=(n, 2))
+    return np.hstack([xy, xy + wh]).astype(np.float32)
+
+
+def _time(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    print(f"{'boxes':>6} {'dedup loop':>11} {'dedup np':>9} {'match loop':>11} {'match np+lap':>13} {'iou pairs':>10} {'iou matrix':>11}  (ms)")
+
+    for n in SIZES:
+        boxes = _boxes(n, rng)
+        moved = boxes + rng.normal(0, 4, size=boxes.shape).astype(np.float32)
+        # same detections for both dedup variants, with real duplicates (every box twice, jittered)
+        dets = [_Det(b) for b in np.concatenate([boxes, moved])[rng.permutation(2 * n)]]
+        assert [id(d) for d in _loop_dedup(dets)] == [id(d) for d in remove_duplicate_detections(dets)]
+
+        def iou_pairs():
+            # every pair, one scalar IoU at a time — the same work as iou_matrix(boxes, moved)
+            return [[_loop_iou(a, b) for b in moved] for a in boxes]
+
+        def match_np():
+            tracker = SimpleTracker()
+            tracker.update(list(boxes), 0.0)
+            tracker.update(list(moved), 0.1)
+
+        def match_loop():
+            _loop_match(list(boxes), list(moved))
+
+        print(
+            f"{n:>6} "
+            f"{_time(_loop_dedup, dets):>11.3f} "
+            f"{_time(remove_duplicate_detections, dets):>9.3f} "
+            f"{_time(match_loop):>11.3f} "
+            f"{_time(match_np):>13.3f} "
+            f"{_time(iou_pairs):>10.3f} "
+            f"{_time(iou_matrix, boxes, moved):>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()